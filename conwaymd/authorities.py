@@ -8,11 +8,12 @@ The higher power that governs the conversion logic.
 
 import os
 import re
+import string
 import sys
-import traceback
 
 from conwaymd._version import __version__
-from conwaymd.constants import CMD_REPLACEMENT_SYNTAX_HELP, GENERIC_ERROR_EXIT_CODE
+from conwaymd.bases import ReplacementWithConcludingReplacements, ReplacementWithContentReplacements
+from conwaymd.constants import CMD_REPLACEMENT_SYNTAX_HELP
 from conwaymd.employables import (
     DeIndentationReplacement,
     ExplicitLinkReplacement,
@@ -33,10 +34,10 @@ from conwaymd.employables import (
     SpecifiedImageReplacement,
     SpecifiedLinkReplacement,
 )
-from conwaymd.exceptions import MissingAttributeException
-from conwaymd.idioms import build_block_tag_regex
+from conwaymd.exceptions import MissingAttributeException, RulesFileException
+from conwaymd.idioms import ANCHORED_BLOCK_TAG_REGEX, BLOCK_TAG_REGEX
 from conwaymd.references import ReferenceMaster
-from conwaymd.utilities import none_to_empty_string
+from conwaymd.utilities import compile_pattern, iterate_lines, none_to_empty_string, truncate
 
 
 class ReplacementAuthority:
@@ -60,48 +61,79 @@ class ReplacementAuthority:
         self._opened_file_names = [cmd_file_name]
         self._replacement_from_id = {}
         self._root_replacement_id = None
-        self._replacement_queue = []
+        self._first_queued_id = None
+        self._last_queued_id = None
+        self._previous_queued_id_from_id = {}
+        self._next_queued_id_from_id = {}
         self._reference_master = ReferenceMaster()
         self._verbose_mode_enabled = verbose_mode_enabled
 
-    @staticmethod
-    def print_error(message, rules_file_name, start_line_number, end_line_number=None):
-        source_file = f'`{rules_file_name}`'
-
-        if end_line_number is None or start_line_number == end_line_number - 1:
-            line_number_range = f'line {start_line_number}'
-        else:
-            line_number_range = f'lines {start_line_number} to {end_line_number - 1}'
-
-        print(f'error: {source_file}, {line_number_range}: {message}', file=sys.stderr)
-
-    @staticmethod
-    def print_traceback(exception):
-        traceback.print_exception(type(exception), exception, exception.__traceback__)
+    _TAG_NAME_CHARACTERS_DELETION_TABLE = str.maketrans('', '', string.ascii_lowercase + string.digits)
+    _FLAG_NAME_CHARACTERS_DELETION_TABLE = str.maketrans('', '', string.ascii_uppercase + '_')
+
+    _RULES_LINE_PATTERN = re.compile(
+        pattern=(
+            r'(?P<rules_inclusion>'
+            r'[<][ ](?:[/](?P<included_file_name>[\S].*?)|(?P<included_file_name_relative>[\S].*?))[\s]*'
+            r')'
+            r'|(?P<class_declaration>(?P<class_name>[A-Za-z]+)[:][\s]+[#](?P<id_>[a-z0-9-.]+))'
+            r'|(?P<attribute_declaration>[-][ ](?P<attribute_name>[a-z_]+)[:](?P<partial_attribute_value>.*))'
+            r'|(?P<substitution_declaration>[*][ ](?P<partial_substitution>.*))'
+            r'|(?P<continuation>[\s]+[\S].*)'
+        ),
+        flags=re.ASCII | re.DOTALL,
+    )
 
     @staticmethod
     def is_whitespace_only(line):
-        return re.fullmatch(pattern=r'[\s]*', string=line, flags=re.ASCII)
+        return line.strip(string.whitespace) == ''  # ASCII whitespace, as `[\s]*` under re.ASCII
 
     @staticmethod
     def is_comment(line):
         return line.startswith('#')
 
     @staticmethod
-    def compute_rules_inclusion_match(line):
-        return re.fullmatch(
-            pattern=r'''
-                [<][ ]
-                    (?:
-                        [/] (?P<included_file_name> [\S][\s\S]*? )
-                            |
-                        (?P<included_file_name_relative> [\S][\s\S]*? )
-                    )
-                [\s]*
-            ''',
-            string=line,
-            flags=re.ASCII | re.VERBOSE,
-        )
+    def compute_rules_line_match(line):
+        """
+        Match a non-blank, non-comment line of replacement rules.
+
+        The kind of line is given by `lastgroup`, being one of `rules_inclusion`, `class_declaration`,
+        `attribute_declaration`, `substitution_declaration`, or `continuation`.
+        """
+        return ReplacementAuthority._RULES_LINE_PATTERN.fullmatch(line)
+
+    @staticmethod
+    def is_nonempty_run_of(value, characters_deletion_table):
+        """
+        Check whether a value is a non-empty run of characters deleted by the given translation table.
+
+        Equivalent to a full match against `[«characters»]+`, but done in a single `str.translate` pass.
+        """
+        return value != '' and value.translate(characters_deletion_table) == ''
+
+    @staticmethod
+    def extract_keyword(
+        attribute_value,
+        keywords,
+        attribute_name,
+        rules_file_name,
+        line_number_range_start,
+        line_number,
+    ):
+        """
+        Extract a keyword from an attribute value that must be exactly one of `keywords` (up to whitespace).
+        """
+        keyword = attribute_value.strip(string.whitespace)
+
+        if keyword not in keywords:
+            raise RulesFileException(
+                f'invalid value `{truncate(keyword)}` for attribute `{attribute_name}`',
+                rules_file_name,
+                line_number_range_start,
+                line_number,
+            )
+
+        return keyword
 
     def process_rules_inclusion_line(self, rules_inclusion_match, rules_file_name, cmd_name, line_number):
         included_file_name_relative = rules_inclusion_match.group('included_file_name_relative')
@@ -116,12 +148,11 @@ class ReplacementAuthority:
             with open(included_file_name, 'r', encoding='utf-8') as included_file:
                 replacement_rules = included_file.read()
         except FileNotFoundError:
-            ReplacementAuthority.print_error(
+            raise RulesFileException(
                 f'file `{included_file_name}` (relative to terminal) not found',
                 rules_file_name,
                 line_number,
             )
-            sys.exit(GENERIC_ERROR_EXIT_CODE)
 
         for opened_file_name in self._opened_file_names:
             if os.path.samefile(opened_file_name, included_file_name):
@@ -129,31 +160,18 @@ class ReplacementAuthority:
                     f'`{opened_file_name}`'
                     for opened_file_name in [*self._opened_file_names, included_file_name]
                 )
-                ReplacementAuthority.print_error(
+                raise RulesFileException(
                     f'recursive inclusion: {recursive_inclusion_string}',
                     rules_file_name,
                     line_number,
                 )
-                sys.exit(GENERIC_ERROR_EXIT_CODE)
 
         self._opened_file_names.append(included_file_name)
         self.legislate(replacement_rules, rules_file_name=included_file_name, cmd_name=cmd_name)
 
-    @staticmethod
-    def compute_class_declaration_match(line):
-        return re.fullmatch(
-            pattern=r'''
-                (?P<class_name> [A-Za-z]+ ) [:]
-                [\s]+
-                [#] (?P<id_> [a-z0-9-.]+ )
-            ''',
-            string=line,
-            flags=re.ASCII | re.VERBOSE,
-        )
-
     def process_class_declaration_line(self, class_declaration_match, rules_file_name, line_number):
         class_name = class_declaration_match.group('class_name')
-        id_ = class_declaration_match.group('id_')
+        id_ = sys.intern(class_declaration_match.group('id_'))
 
         if class_name == 'ReplacementSequence':
             replacement = ReplacementSequence(id_, self._verbose_mode_enabled)
@@ -192,36 +210,23 @@ class ReplacementAuthority:
         elif class_name == 'ReferencedLinkReplacement':
             replacement = ReferencedLinkReplacement(id_, self._reference_master, self._verbose_mode_enabled)
         else:
-            ReplacementAuthority.print_error(
+            raise RulesFileException(
                 f'unrecognised replacement class `{class_name}`',
                 rules_file_name,
                 line_number,
             )
-            sys.exit(GENERIC_ERROR_EXIT_CODE)
 
         if id_ in self._replacement_from_id:
-            ReplacementAuthority.print_error(
+            raise RulesFileException(
                 f'replacement already declared with id `{id_}`',
                 rules_file_name,
                 line_number,
             )
-            sys.exit(GENERIC_ERROR_EXIT_CODE)
 
         line_number_range_start = line_number
 
         return class_name, replacement, line_number_range_start
 
-    @staticmethod
-    def compute_attribute_declaration_match(line):
-        return re.fullmatch(
-            pattern=r'''
-                [-][ ] (?P<attribute_name> [a-z_]+ ) [:]
-                (?P<partial_attribute_value> [\s\S]* )
-            ''',
-            string=line,
-            flags=re.ASCII | re.VERBOSE,
-        )
-
     @staticmethod
     def process_attribute_declaration_line(
         attribute_declaration_match,
@@ -232,21 +237,19 @@ class ReplacementAuthority:
         line_number,
     ):
         if replacement is None:
-            ReplacementAuthority.print_error(
+            raise RulesFileException(
                 f'attribute declaration without an active class declaration',
                 rules_file_name,
                 line_number,
             )
-            sys.exit(GENERIC_ERROR_EXIT_CODE)
 
-        attribute_name = attribute_declaration_match.group('attribute_name')
+        attribute_name = sys.intern(attribute_declaration_match.group('attribute_name'))  # for dispatch in `stage`
         if attribute_name not in replacement.attribute_names():
-            ReplacementAuthority.print_error(
+            raise RulesFileException(
                 f'unrecognised attribute `{attribute_name}` for `{class_name}`',
                 rules_file_name,
                 line_number,
             )
-            sys.exit(GENERIC_ERROR_EXIT_CODE)
 
         partial_attribute_value = attribute_declaration_match.group('partial_attribute_value')
         attribute_value = none_to_empty_string(attribute_value) + partial_attribute_value
@@ -255,14 +258,6 @@ class ReplacementAuthority:
 
         return attribute_name, attribute_value, line_number_range_start
 
-    @staticmethod
-    def compute_substitution_declaration_match(line):
-        return re.fullmatch(
-            pattern=r'[*][ ] (?P<partial_substitution> [\s\S]* )',
-            string=line,
-            flags=re.ASCII | re.VERBOSE,
-        )
-
     @staticmethod
     def process_substitution_declaration_line(
         replacement,
@@ -272,12 +267,11 @@ class ReplacementAuthority:
         line_number,
     ):
         if replacement is None:
-            ReplacementAuthority.print_error(
+            raise RulesFileException(
                 f'substitution declaration without an active class declaration',
                 rules_file_name,
                 line_number,
             )
-            sys.exit(GENERIC_ERROR_EXIT_CODE)
 
         partial_substitution = substitution_declaration_match.group('partial_substitution')
         substitution = none_to_empty_string(substitution) + partial_substitution
@@ -286,14 +280,6 @@ class ReplacementAuthority:
 
         return substitution, line_number_range_start
 
-    @staticmethod
-    def compute_continuation_match(line):
-        return re.fullmatch(
-            pattern=r'(?P<continuation> [\s]+ [\S][\s\S]* )',
-            string=line,
-            flags=re.ASCII | re.VERBOSE,
-        )
-
     @staticmethod
     def process_continuation_line(
         continuation_match,
@@ -310,34 +296,34 @@ class ReplacementAuthority:
         elif substitution is not None:
             substitution = substitution + '\n' + continuation
         else:
-            ReplacementAuthority.print_error(
+            raise RulesFileException(
                 'continuation only allowed for attribute or substitution declarations',
                 rules_file_name,
                 line_number,
             )
-            sys.exit(GENERIC_ERROR_EXIT_CODE)
 
         return attribute_value, substitution
 
+    _ALLOWED_FLAG_PATTERN = re.compile(
+        pattern=r'''
+            (?P<whitespace_only> \A [\s]* \Z )
+                |
+            (?P<none_keyword> \A [\s]* NONE [\s]* \Z )
+                |
+            [\s]*
+            (?:
+                (?P<flag_letter> [a-z] ) = (?P<flag_name> [A-Z_]+ ) (?= [\s] | \Z )
+                    |
+                (?P<invalid_syntax> [\S]+ )
+            )
+            [\s]*
+        ''',
+        flags=re.ASCII | re.VERBOSE,
+    )
+
     @staticmethod
     def compute_allowed_flag_matches(attribute_value):
-        return re.finditer(
-            pattern=r'''
-                (?P<whitespace_only> \A [\s]* \Z )
-                    |
-                (?P<none_keyword> \A [\s]* NONE [\s]* \Z )
-                    |
-                [\s]*
-                (?:
-                    (?P<flag_letter> [a-z] ) = (?P<flag_name> [A-Z_]+ ) (?= [\s] | \Z )
-                        |
-                    (?P<invalid_syntax> [\S]+ )
-                )
-                [\s]*
-            ''',
-            string=attribute_value,
-            flags=re.ASCII | re.VERBOSE,
-        )
+        return ReplacementAuthority._ALLOWED_FLAG_PATTERN.finditer(attribute_value)
 
     @staticmethod
     def stage_allowed_flags(replacement, attribute_value, rules_file_name, line_number_range_start, line_number):
@@ -345,23 +331,21 @@ class ReplacementAuthority:
 
         for allowed_flag_match in ReplacementAuthority.compute_allowed_flag_matches(attribute_value):
             if allowed_flag_match.group('whitespace_only') is not None:
-                ReplacementAuthority.print_error(
+                raise RulesFileException(
                     f'invalid specification `` for attribute `allowed_flags`',
                     rules_file_name,
                     line_number_range_start,
                     line_number,
                 )
-                sys.exit(GENERIC_ERROR_EXIT_CODE)
 
             invalid_syntax = allowed_flag_match.group('invalid_syntax')
             if invalid_syntax is not None:
-                ReplacementAuthority.print_error(
-                    f'invalid specification `{invalid_syntax}` for attribute `allowed_flags`',
+                raise RulesFileException(
+                    f'invalid specification `{truncate(invalid_syntax)}` for attribute `allowed_flags`',
                     rules_file_name,
                     line_number_range_start,
                     line_number,
                 )
-                sys.exit(GENERIC_ERROR_EXIT_CODE)
 
             if allowed_flag_match.group('none_keyword') is not None:
                 return
@@ -372,58 +356,38 @@ class ReplacementAuthority:
 
         replacement.flag_name_from_letter = flag_name_from_letter
 
-    @staticmethod
-    def compute_apply_mode_match(attribute_value):
-        return re.fullmatch(
-            pattern=r'''
-                [\s]*
-                (?:
-                    (?P<apply_mode> SIMULTANEOUS | SEQUENTIAL )
-                        |
-                    (?P<invalid_value> [\s\S]*? )
-                    )
-                [\s]*
-            ''',
-            string=attribute_value,
-            flags=re.ASCII | re.VERBOSE
-        )
-
     @staticmethod
     def stage_apply_mode(replacement, attribute_value, rules_file_name, line_number_range_start, line_number):
-        apply_mode_match = ReplacementAuthority.compute_apply_mode_match(attribute_value)
+        apply_mode = ReplacementAuthority.extract_keyword(
+            attribute_value,
+            ('SIMULTANEOUS', 'SEQUENTIAL'),
+            'apply_mode',
+            rules_file_name,
+            line_number_range_start,
+            line_number,
+        )
+        replacement.apply_substitutions_simultaneously = apply_mode == 'SIMULTANEOUS'
 
-        invalid_value = apply_mode_match.group('invalid_value')
-        if invalid_value is not None:
-            ReplacementAuthority.print_error(
-                f'invalid value `{invalid_value}` for attribute `apply_mode`',
-                rules_file_name,
-                line_number_range_start,
-                line_number,
+    _ATTRIBUTE_SPECIFICATIONS_PATTERN = re.compile(
+        pattern=r'''
+            [\s]*
+            (?:
+                (?P<none_keyword> NONE )
+                    |
+                (?P<empty_keyword> EMPTY )
+                    |
+                (?P<attribute_specifications> [\S].*? )
+                    |
+                (?P<invalid_value> .*? )
             )
-            sys.exit(GENERIC_ERROR_EXIT_CODE)
-
-        apply_mode = apply_mode_match.group('apply_mode')
-        replacement.apply_substitutions_simultaneously = apply_mode == 'SIMULTANEOUS'
+            [\s]*
+        ''',
+        flags=re.ASCII | re.DOTALL | re.VERBOSE,
+    )
 
     @staticmethod
     def compute_attribute_specifications_match(attribute_value):
-        return re.fullmatch(
-            pattern=r'''
-                [\s]*
-                (?:
-                    (?P<none_keyword> NONE )
-                        |
-                    (?P<empty_keyword> EMPTY )
-                        |
-                    (?P<attribute_specifications> [\S][\s\S]*? )
-                        |
-                    (?P<invalid_value> [\s\S]*? )
-                )
-                [\s]*
-            ''',
-            string=attribute_value,
-            flags=re.ASCII | re.VERBOSE,
-        )
+        return ReplacementAuthority._ATTRIBUTE_SPECIFICATIONS_PATTERN.fullmatch(attribute_value)
 
     @staticmethod
     def stage_attribute_specifications(
@@ -437,13 +401,12 @@ class ReplacementAuthority:
 
         invalid_value = attribute_specifications_match.group('invalid_value')
         if invalid_value is not None:
-            ReplacementAuthority.print_error(
-                f'invalid value `{invalid_value}` for attribute `attribute_specifications`',
+            raise RulesFileException(
+                f'invalid value `{truncate(invalid_value)}` for attribute `attribute_specifications`',
                 rules_file_name,
                 line_number_range_start,
                 line_number,
             )
-            sys.exit(GENERIC_ERROR_EXIT_CODE)
 
         if attribute_specifications_match.group('none_keyword') is not None:
             return
@@ -455,21 +418,22 @@ class ReplacementAuthority:
         attribute_specifications = attribute_specifications_match.group('attribute_specifications')
         replacement.attribute_specifications = attribute_specifications
 
+    _CLOSING_DELIMITER_PATTERN = re.compile(
+        pattern=r'''
+            [\s]*
+            (?:
+                (?P<closing_delimiter> [\S].*? )
+                    |
+                (?P<invalid_value> .*? )
+            )
+            [\s]*
+        ''',
+        flags=re.ASCII | re.DOTALL | re.VERBOSE,
+    )
+
     @staticmethod
     def compute_closing_delimiter_match(attribute_value):
-        return re.fullmatch(
-            pattern=r'''
-                [\s]*
-                (?:
-                    (?P<closing_delimiter> [\S][\s\S]*? )
-                        |
-                    (?P<invalid_value> [\s\S]*? )
-                )
-                [\s]*
-            ''',
-            string=attribute_value,
-            flags=re.ASCII | re.VERBOSE,
-        )
+        return ReplacementAuthority._CLOSING_DELIMITER_PATTERN.fullmatch(attribute_value)
 
     @staticmethod
     def stage_closing_delimiter(replacement, attribute_value, rules_file_name, line_number_range_start, line_number):
@@ -477,35 +441,35 @@ class ReplacementAuthority:
 
         invalid_value = closing_delimiter_match.group('invalid_value')
         if invalid_value is not None:
-            ReplacementAuthority.print_error(
-                f'invalid value `{invalid_value}` for attribute `closing_delimiter`',
+            raise RulesFileException(
+                f'invalid value `{truncate(invalid_value)}` for attribute `closing_delimiter`',
                 rules_file_name,
                 line_number_range_start,
                 line_number,
             )
-            sys.exit(GENERIC_ERROR_EXIT_CODE)
 
         closing_delimiter = closing_delimiter_match.group('closing_delimiter')
         replacement.closing_delimiter = closing_delimiter
 
+    _CONCLUDING_REPLACEMENT_PATTERN = re.compile(
+        pattern=r'''
+            (?P<whitespace_only> \A [\s]* \Z )
+                |
+            (?P<none_keyword> \A [\s]* NONE [\s]* \Z )
+                |
+            (?:
+                [#] (?P<id_> [a-z0-9-.]+ ) (?= [\s] | \Z )
+                    |
+                (?P<invalid_syntax> [\S]+ )
+            )
+            [\s]*
+        ''',
+        flags=re.ASCII | re.VERBOSE,
+    )
+
     @staticmethod
     def compute_concluding_replacement_matches(attribute_value):
-        return re.finditer(
-            pattern=r'''
-                (?P<whitespace_only> \A [\s]* \Z )
-                    |
-                (?P<none_keyword> \A [\s]* NONE [\s]* \Z )
-                    |
-                (?:
-                    [#] (?P<id_> [a-z0-9-.]+ ) (?= [\s] | \Z )
-                        |
-                    (?P<invalid_syntax> [\S]+ )
-                )
-                [\s]*
-            ''',
-            string=attribute_value,
-            flags=re.ASCII | re.VERBOSE,
-        )
+        return ReplacementAuthority._CONCLUDING_REPLACEMENT_PATTERN.finditer(attribute_value)
 
     def stage_concluding_replacements(
         self,
@@ -520,64 +484,62 @@ class ReplacementAuthority:
         concluding_replacement_matches = ReplacementAuthority.compute_concluding_replacement_matches(attribute_value)
         for concluding_replacement_match in concluding_replacement_matches:
             if concluding_replacement_match.group('whitespace_only') is not None:
-                ReplacementAuthority.print_error(
+                raise RulesFileException(
                     f'invalid specification `` for attribute `concluding_replacements`',
                     rules_file_name,
                     line_number_range_start,
                     line_number,
                 )
-                sys.exit(GENERIC_ERROR_EXIT_CODE)
 
             invalid_syntax = concluding_replacement_match.group('invalid_syntax')
             if invalid_syntax is not None:
-                ReplacementAuthority.print_error(
-                    f'invalid specification `{invalid_syntax}` for attribute `concluding_replacements`',
+                raise RulesFileException(
+                    f'invalid specification `{truncate(invalid_syntax)}` for attribute `concluding_replacements`',
                     rules_file_name,
                     line_number_range_start,
                     line_number,
                 )
-                sys.exit(GENERIC_ERROR_EXIT_CODE)
 
             if concluding_replacement_match.group('none_keyword') is not None:
                 return
 
-            concluding_replacement_id = concluding_replacement_match.group('id_')
+            concluding_replacement_id = sys.intern(concluding_replacement_match.group('id_'))
             if concluding_replacement_id == replacement.id_:
                 concluding_replacement = replacement
             else:
                 try:
                     concluding_replacement = self._replacement_from_id[concluding_replacement_id]
                 except KeyError:
-                    ReplacementAuthority.print_error(
+                    raise RulesFileException(
                         f'undefined replacement `#{concluding_replacement_id}`',
                         rules_file_name,
                         line_number_range_start,
                         line_number,
                     )
-                    sys.exit(GENERIC_ERROR_EXIT_CODE)
 
             concluding_replacements.append(concluding_replacement)
 
         replacement.concluding_replacements = concluding_replacements
 
+    _CONTENT_REPLACEMENT_PATTERN = re.compile(
+        pattern=r'''
+            (?P<whitespace_only> \A [\s]* \Z )
+                |
+            (?P<none_keyword> \A [\s]* NONE [\s]* \Z )
+                |
+            (?:
+                [#] (?P<id_> [a-z0-9-.]+ ) (?= [\s] | \Z )
+                    |
+                (?P<invalid_syntax> [\S]+ )
+            )
+            [\s]*
+        ''',
+        flags=re.ASCII | re.VERBOSE,
+    )
+
     @staticmethod
     def compute_content_replacement_matches(attribute_value):
-        return re.finditer(
-            pattern=r'''
-                (?P<whitespace_only> \A [\s]* \Z )
-                    |
-                (?P<none_keyword> \A [\s]* NONE [\s]* \Z )
-                    |
-                (?:
-                    [#] (?P<id_> [a-z0-9-.]+ ) (?= [\s] | \Z )
-                        |
-                    (?P<invalid_syntax> [\S]+ )
-                )
-                [\s]*
-            ''',
-            string=attribute_value,
-            flags=re.ASCII | re.VERBOSE,
-        )
+        return ReplacementAuthority._CONTENT_REPLACEMENT_PATTERN.finditer(attribute_value)
 
     def stage_content_replacements(
         self,
@@ -591,66 +553,64 @@ class ReplacementAuthority:
 
         for content_replacement_match in ReplacementAuthority.compute_content_replacement_matches(attribute_value):
             if content_replacement_match.group('whitespace_only') is not None:
-                ReplacementAuthority.print_error(
+                raise RulesFileException(
                     f'invalid specification `` for attribute `content_replacements`',
                     rules_file_name,
                     line_number_range_start,
                     line_number,
                 )
-                sys.exit(GENERIC_ERROR_EXIT_CODE)
 
             invalid_syntax = content_replacement_match.group('invalid_syntax')
             if invalid_syntax is not None:
-                ReplacementAuthority.print_error(
-                    f'invalid specification `{invalid_syntax}` for attribute `content_replacements`',
+                raise RulesFileException(
+                    f'invalid specification `{truncate(invalid_syntax)}` for attribute `content_replacements`',
                     rules_file_name,
                     line_number_range_start,
                     line_number,
                 )
-                sys.exit(GENERIC_ERROR_EXIT_CODE)
 
             if content_replacement_match.group('none_keyword') is not None:
                 return
 
-            content_replacement_id = content_replacement_match.group('id_')
+            content_replacement_id = sys.intern(content_replacement_match.group('id_'))
             if content_replacement_id == replacement.id_:
                 content_replacement = replacement
             else:
                 try:
                     content_replacement = self._replacement_from_id[content_replacement_id]
                 except KeyError:
-                    ReplacementAuthority.print_error(
+                    raise RulesFileException(
                         f'undefined replacement `#{content_replacement_id}`',
                         rules_file_name,
                         line_number_range_start,
                         line_number,
                     )
-                    sys.exit(GENERIC_ERROR_EXIT_CODE)
 
             content_replacements.append(content_replacement)
 
         replacement.content_replacements = content_replacements
 
+    _DELIMITER_CONVERSION_PATTERN = re.compile(
+        pattern=r'''
+            (?P<whitespace_only> \A [\s]* \Z )
+                |
+            [\s]*
+            (?:
+                (?P<delimiter>
+                (?P<delimiter_character> [\S] ) (?P=delimiter_character)?
+            )
+                = (?P<tag_name> [a-z0-9]+ ) (?= [\s] | \Z )
+                |
+            (?P<invalid_syntax> [\S]+ )
+            )
+            [\s]*
+        ''',
+        flags=re.ASCII | re.VERBOSE,
+    )
+
     @staticmethod
     def compute_delimiter_conversion_matches(attribute_value):
-        return re.finditer(
-            pattern=r'''
-                (?P<whitespace_only> \A [\s]* \Z )
-                    |
-                [\s]*
-                (?:
-                    (?P<delimiter>
-                    (?P<delimiter_character> [\S] ) (?P=delimiter_character)?
-                )
-                    = (?P<tag_name> [a-z0-9]+ ) (?= [\s] | \Z )
-                    |
-                (?P<invalid_syntax> [\S]+ )
-                )
-                [\s]*
-            ''',
-            string=attribute_value,
-            flags=re.ASCII | re.VERBOSE,
-        )
+        return ReplacementAuthority._DELIMITER_CONVERSION_PATTERN.finditer(attribute_value)
 
     @staticmethod
     def stage_delimiter_conversion(
@@ -664,23 +624,21 @@ class ReplacementAuthority:
 
         for delimiter_conversion_match in ReplacementAuthority.compute_delimiter_conversion_matches(attribute_value):
             if delimiter_conversion_match.group('whitespace_only') is not None:
-                ReplacementAuthority.print_error(
+                raise RulesFileException(
                     f'invalid specification `` for attribute `delimiter_conversion`',
                     rules_file_name,
                     line_number_range_start,
                     line_number,
                 )
-                sys.exit(GENERIC_ERROR_EXIT_CODE)
 
             invalid_syntax = delimiter_conversion_match.group('invalid_syntax')
             if invalid_syntax is not None:
-                ReplacementAuthority.print_error(
-                    f'invalid specification `{invalid_syntax}` for attribute `delimiter_conversion`',
+                raise RulesFileException(
+                    f'invalid specification `{truncate(invalid_syntax)}` for attribute `delimiter_conversion`',
                     rules_file_name,
                     line_number_range_start,
                     line_number,
                 )
-                sys.exit(GENERIC_ERROR_EXIT_CODE)
 
             character = delimiter_conversion_match.group('delimiter_character')
             length = len(delimiter_conversion_match.group('delimiter'))
@@ -693,23 +651,24 @@ class ReplacementAuthority:
 
         replacement.tag_name_from_delimiter_length_from_character = tag_name_from_delimiter_length_from_character
 
+    _ENDING_PATTERN_PATTERN = re.compile(
+        pattern=r'''
+            [\s]*
+            (?:
+                (?P<none_keyword> NONE )
+                    |
+                (?P<ending_pattern> [\S].*? )
+                    |
+                (?P<invalid_value> .*? )
+            )
+            [\s]*
+        ''',
+        flags=re.ASCII | re.DOTALL | re.VERBOSE,
+    )
+
     @staticmethod
     def compute_ending_pattern_match(attribute_value):
-        return re.fullmatch(
-            pattern=r'''
-                [\s]*
-                (?:
-                    (?P<none_keyword> NONE )
-                        |
-                    (?P<ending_pattern> [\S][\s\S]*? )
-                        |
-                    (?P<invalid_value> [\s\S]*? )
-                )
-                [\s]*
-            ''',
-            string=attribute_value,
-            flags=re.ASCII | re.VERBOSE,
-        )
+        return ReplacementAuthority._ENDING_PATTERN_PATTERN.fullmatch(attribute_value)
 
     @staticmethod
     def stage_ending_pattern(
@@ -723,13 +682,12 @@ class ReplacementAuthority:
 
         invalid_value = ending_pattern_match.group('invalid_value')
         if invalid_value is not None:
-            ReplacementAuthority.print_error(
-                f'invalid value `{invalid_value}` for attribute `ending_pattern`',
+            raise RulesFileException(
+                f'invalid value `{truncate(invalid_value)}` for attribute `ending_pattern`',
                 rules_file_name,
                 line_number_range_start,
                 line_number,
             )
-            sys.exit(GENERIC_ERROR_EXIT_CODE)
 
         if ending_pattern_match.group('none_keyword') is not None:
             return
@@ -737,45 +695,46 @@ class ReplacementAuthority:
         ending_pattern = ending_pattern_match.group('ending_pattern')
 
         try:
-            ending_pattern_compiled = re.compile(pattern=ending_pattern, flags=re.ASCII | re.MULTILINE | re.VERBOSE)
+            ending_pattern_compiled = compile_pattern(
+                pattern=ending_pattern,
+                flags=re.ASCII | re.MULTILINE | re.VERBOSE,
+            )
         except re.error as pattern_exception:
-            ReplacementAuthority.print_error(
-                f'bad regex pattern `{ending_pattern}`',
+            raise RulesFileException(
+                f'bad regex pattern `{truncate(ending_pattern)}`',
                 rules_file_name,
                 line_number_range_start,
                 line_number,
-            )
-            ReplacementAuthority.print_traceback(pattern_exception)
-            sys.exit(GENERIC_ERROR_EXIT_CODE)
+            ) from pattern_exception
 
         if len(ending_pattern_compiled.groupindex) > 0:
-            ReplacementAuthority.print_error(
+            raise RulesFileException(
                 f'named capture groups not allowed in `ending_pattern`',
                 rules_file_name,
                 line_number_range_start,
                 line_number,
             )
-            sys.exit(GENERIC_ERROR_EXIT_CODE)
 
         replacement.ending_pattern = ending_pattern
 
+    _EPILOGUE_DELIMITER_PATTERN = re.compile(
+        pattern=r'''
+            [\s]*
+            (?:
+                (?P<none_keyword> NONE )
+                    |
+                (?P<epilogue_delimiter> [\S].*? )
+                    |
+                (?P<invalid_value> .*? )
+            )
+            [\s]*
+        ''',
+        flags=re.ASCII | re.DOTALL | re.VERBOSE,
+    )
+
     @staticmethod
     def compute_epilogue_delimiter_match(attribute_value):
-        return re.fullmatch(
-            pattern=r'''
-                [\s]*
-                (?:
-                    (?P<none_keyword> NONE )
-                        |
-                    (?P<epilogue_delimiter> [\S][\s\S]*? )
-                        |
-                    (?P<invalid_value> [\s\S]*? )
-                )
-                [\s]*
-            ''',
-            string=attribute_value,
-            flags=re.ASCII | re.VERBOSE,
-        )
+        return ReplacementAuthority._EPILOGUE_DELIMITER_PATTERN.fullmatch(attribute_value)
 
     @staticmethod
     def stage_epilogue_delimiter(replacement, attribute_value, rules_file_name, line_number_range_start, line_number):
@@ -783,13 +742,12 @@ class ReplacementAuthority:
 
         invalid_value = epilogue_delimiter_match.group('invalid_value')
         if invalid_value is not None:
-            ReplacementAuthority.print_error(
-                f'invalid value `{invalid_value}` for attribute `epilogue_delimiter`',
+            raise RulesFileException(
+                f'invalid value `{truncate(invalid_value)}` for attribute `epilogue_delimiter`',
                 rules_file_name,
                 line_number_range_start,
                 line_number,
             )
-            sys.exit(GENERIC_ERROR_EXIT_CODE)
 
         if epilogue_delimiter_match.group('none_keyword') is not None:
             return
@@ -797,24 +755,25 @@ class ReplacementAuthority:
         epilogue_delimiter = epilogue_delimiter_match.group('epilogue_delimiter')
         replacement.epilogue_delimiter = epilogue_delimiter
 
+    _EXTENSIBLE_DELIMITER_PATTERN = re.compile(
+        pattern=r'''
+            [\s]*
+            (?:
+                (?P<extensible_delimiter>
+                    (?P<extensible_delimiter_character> [\S] )
+                    (?P=extensible_delimiter_character)*
+                )
+                    |
+                (?P<invalid_value> .*? )
+            )
+            [\s]*
+        ''',
+        flags=re.ASCII | re.DOTALL | re.VERBOSE,
+    )
+
     @staticmethod
     def compute_extensible_delimiter_match(attribute_value):
-        return re.fullmatch(
-            pattern=r'''
-                [\s]*
-                (?:
-                    (?P<extensible_delimiter>
-                        (?P<extensible_delimiter_character> [\S] )
-                        (?P=extensible_delimiter_character)*
-                    )
-                        |
-                    (?P<invalid_value> [\s\S]*? )
-                )
-                [\s]*
-            ''',
-            string=attribute_value,
-            flags=re.ASCII | re.VERBOSE,
-        )
+        return ReplacementAuthority._EXTENSIBLE_DELIMITER_PATTERN.fullmatch(attribute_value)
 
     @staticmethod
     def stage_extensible_delimiter(
@@ -828,13 +787,13 @@ class ReplacementAuthority:
 
         invalid_value = extensible_delimiter_match.group('invalid_value')
         if invalid_value is not None:
-            ReplacementAuthority.print_error(
-                f'invalid value `{invalid_value}` not a character repeated for attribute `extensible_delimiter`',
+            raise RulesFileException(
+                f'invalid value `{truncate(invalid_value)}` not a character repeated'
+                f' for attribute `extensible_delimiter`',
                 rules_file_name,
                 line_number_range_start,
                 line_number,
             )
-            sys.exit(GENERIC_ERROR_EXIT_CODE)
 
         extensible_delimiter_character = extensible_delimiter_match.group('extensible_delimiter_character')
         extensible_delimiter = extensible_delimiter_match.group('extensible_delimiter')
@@ -843,59 +802,42 @@ class ReplacementAuthority:
         replacement.extensible_delimiter_character = extensible_delimiter_character
         replacement.extensible_delimiter_min_length = extensible_delimiter_min_length
 
-    @staticmethod
-    def compute_negative_flag_match(attribute_value):
-        return re.fullmatch(
-            pattern=r'''
-                [\s]*
-                (?:
-                    (?P<none_keyword> NONE )
-                        |
-                    (?P<negative_flag_name> [A-Z_]+ )
-                        |
-                    (?P<invalid_value> [\s\S]*? )
-                )
-                [\s]*
-            ''',
-            string=attribute_value,
-            flags=re.ASCII | re.VERBOSE,
-        )
-
     @staticmethod
     def stage_negative_flag(replacement, attribute_value, rules_file_name, line_number_range_start, line_number):
-        negative_flag_match = ReplacementAuthority.compute_negative_flag_match(attribute_value)
+        negative_flag_name = attribute_value.strip(string.whitespace)
 
-        invalid_value = negative_flag_match.group('invalid_value')
-        if invalid_value is not None:
-            ReplacementAuthority.print_error(
-                f'invalid value `{invalid_value}` for attribute `negative_flag`',
+        if negative_flag_name == 'NONE':
+            return
+
+        if not ReplacementAuthority.is_nonempty_run_of(
+            negative_flag_name,
+            ReplacementAuthority._FLAG_NAME_CHARACTERS_DELETION_TABLE,
+        ):
+            raise RulesFileException(
+                f'invalid value `{truncate(negative_flag_name)}` for attribute `negative_flag`',
                 rules_file_name,
                 line_number_range_start,
                 line_number,
             )
-            sys.exit(GENERIC_ERROR_EXIT_CODE)
-
-        if negative_flag_match.group('none_keyword') is not None:
-            return
 
-        negative_flag_name = negative_flag_match.group('negative_flag_name')
         replacement.negative_flag_name = negative_flag_name
 
+    _OPENING_DELIMITER_PATTERN = re.compile(
+        pattern=r'''
+            [\s]*
+            (?:
+                (?P<opening_delimiter> [\S].*? )
+                    |
+                (?P<invalid_value> .*? )
+            )
+            [\s]*
+        ''',
+        flags=re.ASCII | re.DOTALL | re.VERBOSE,
+    )
+
     @staticmethod
     def compute_opening_delimiter_match(attribute_value):
-        return re.fullmatch(
-            pattern=r'''
-                [\s]*
-                (?:
-                    (?P<opening_delimiter> [\S][\s\S]*? )
-                        |
-                    (?P<invalid_value> [\s\S]*? )
-                )
-                [\s]*
-            ''',
-            string=attribute_value,
-            flags=re.ASCII | re.VERBOSE,
-        )
+        return ReplacementAuthority._OPENING_DELIMITER_PATTERN.fullmatch(attribute_value)
 
     @staticmethod
     def stage_opening_delimiter(replacement, attribute_value, rules_file_name, line_number_range_start, line_number):
@@ -903,112 +845,73 @@ class ReplacementAuthority:
 
         invalid_value = opening_delimiter_match.group('invalid_value')
         if invalid_value is not None:
-            ReplacementAuthority.print_error(
-                f'invalid value `{invalid_value}` for attribute `opening_delimiter`',
+            raise RulesFileException(
+                f'invalid value `{truncate(invalid_value)}` for attribute `opening_delimiter`',
                 rules_file_name,
                 line_number_range_start,
                 line_number,
             )
-            sys.exit(GENERIC_ERROR_EXIT_CODE)
 
         opening_delimiter = opening_delimiter_match.group('opening_delimiter')
         replacement.opening_delimiter = opening_delimiter
 
-    @staticmethod
-    def compute_positive_flag_match(attribute_value):
-        return re.fullmatch(
-            pattern=r'''
-                [\s]*
-                (?:
-                    (?P<none_keyword> NONE )
-                        |
-                    (?P<positive_flag_name> [A-Z_]+ )
-                        |
-                    (?P<invalid_value> [\s\S]*? )
-                )
-                [\s]*
-            ''',
-            string=attribute_value,
-            flags=re.ASCII | re.VERBOSE,
-        )
-
     @staticmethod
     def stage_positive_flag(replacement, attribute_value, rules_file_name, line_number_range_start, line_number):
-        positive_flag_match = ReplacementAuthority.compute_positive_flag_match(attribute_value)
+        positive_flag_name = attribute_value.strip(string.whitespace)
 
-        invalid_value = positive_flag_match.group('invalid_value')
-        if invalid_value is not None:
-            ReplacementAuthority.print_error(
-                f'invalid value `{invalid_value}` for attribute `positive_flag`',
+        if positive_flag_name == 'NONE':
+            return
+
+        if not ReplacementAuthority.is_nonempty_run_of(
+            positive_flag_name,
+            ReplacementAuthority._FLAG_NAME_CHARACTERS_DELETION_TABLE,
+        ):
+            raise RulesFileException(
+                f'invalid value `{truncate(positive_flag_name)}` for attribute `positive_flag`',
                 rules_file_name,
                 line_number_range_start,
                 line_number,
             )
-            sys.exit(GENERIC_ERROR_EXIT_CODE)
-
-        if positive_flag_match.group('none_keyword') is not None:
-            return
 
-        positive_flag_name = positive_flag_match.group('positive_flag_name')
         replacement.positive_flag_name = positive_flag_name
 
-    @staticmethod
-    def compute_prohibited_content_match(attribute_value):
-        return re.fullmatch(
-            pattern=r'''
-                [\s]*
-                (?:
-                    (?P<none_keyword> NONE )
-                        |
-                    (?P<prohibited_content> BLOCKS | ANCHORED_BLOCKS )
-                        |
-                    (?P<invalid_value> [\s\S]*? )
-                )
-                [\s]*
-            ''',
-            string=attribute_value,
-            flags=re.ASCII | re.VERBOSE,
-        )
-
     @staticmethod
     def stage_prohibited_content(replacement, attribute_value, rules_file_name, line_number_range_start, line_number):
-        prohibited_content_match = ReplacementAuthority.compute_prohibited_content_match(attribute_value)
-
-        invalid_value = prohibited_content_match.group('invalid_value')
-        if invalid_value is not None:
-            ReplacementAuthority.print_error(
-                f'invalid value `{invalid_value}` for attribute `prohibited_content`',
-                rules_file_name,
-                line_number_range_start,
-                line_number,
-            )
-            sys.exit(GENERIC_ERROR_EXIT_CODE)
+        prohibited_content = ReplacementAuthority.extract_keyword(
+            attribute_value,
+            ('NONE', 'BLOCKS', 'ANCHORED_BLOCKS'),
+            'prohibited_content',
+            rules_file_name,
+            line_number_range_start,
+            line_number,
+        )
 
-        if prohibited_content_match.group('none_keyword') is not None:
+        if prohibited_content == 'NONE':
             return
 
-        prohibited_content = prohibited_content_match.group('prohibited_content')
-        require_anchoring = prohibited_content == 'ANCHORED_BLOCKS'
-        prohibited_content_regex = build_block_tag_regex(require_anchoring)
-        replacement.prohibited_content_regex = prohibited_content_regex
+        if prohibited_content == 'ANCHORED_BLOCKS':
+            replacement.prohibited_content_regex = ANCHORED_BLOCK_TAG_REGEX
+        else:
+            replacement.prohibited_content_regex = BLOCK_TAG_REGEX
+
+    _PROLOGUE_DELIMITER_PATTERN = re.compile(
+        pattern=r'''
+            [\s]*
+            (?:
+                (?P<none_keyword> NONE )
+                    |
+                (?P<prologue_delimiter> [\S].*? )
+                    |
+                (?P<invalid_value> .*? )
+            )
+            [\s]*
+        ''',
+        flags=re.ASCII | re.DOTALL | re.VERBOSE,
+    )
 
     @staticmethod
     def compute_prologue_delimiter_match(attribute_value):
-        return re.fullmatch(
-            pattern=r'''
-                [\s]*
-                (?:
-                    (?P<none_keyword> NONE )
-                        |
-                    (?P<prologue_delimiter> [\S][\s\S]*? )
-                        |
-                    (?P<invalid_value> [\s\S]*? )
-                )
-                [\s]*
-            ''',
-            string=attribute_value,
-            flags=re.ASCII | re.VERBOSE,
-        )
+        return ReplacementAuthority._PROLOGUE_DELIMITER_PATTERN.fullmatch(attribute_value)
 
     @staticmethod
     def stage_prologue_delimiter(replacement, attribute_value, rules_file_name, line_number_range_start, line_number):
@@ -1016,13 +919,12 @@ class ReplacementAuthority:
 
         invalid_value = prologue_delimiter_match.group('invalid_value')
         if invalid_value is not None:
-            ReplacementAuthority.print_error(
-                f'invalid value `{invalid_value}` for attribute `prologue_delimiter`',
+            raise RulesFileException(
+                f'invalid value `{truncate(invalid_value)}` for attribute `prologue_delimiter`',
                 rules_file_name,
                 line_number_range_start,
                 line_number,
             )
-            sys.exit(GENERIC_ERROR_EXIT_CODE)
 
         if prologue_delimiter_match.group('none_keyword') is not None:
             return
@@ -1030,172 +932,167 @@ class ReplacementAuthority:
         prologue_delimiter = prologue_delimiter_match.group('prologue_delimiter')
         replacement.prologue_delimiter = prologue_delimiter
 
+    _QUEUE_POSITION_PATTERN = re.compile(
+        pattern=r'''
+            [\s]*
+            (?:
+                (?P<none_keyword> NONE )
+                    |
+                (?P<root_keyword> ROOT )
+                    |
+                (?P<queue_position_type> BEFORE | AFTER )
+                [ ]
+                [#] (?P<queue_reference_id> [a-z-.]+ )
+                    |
+                (?P<invalid_value> .*? )
+            )
+            [\s]*
+        ''',
+        flags=re.ASCII | re.DOTALL | re.VERBOSE,
+    )
+
     @staticmethod
     def compute_queue_position_match(attribute_value):
-        return re.fullmatch(
-            pattern=r'''
-                [\s]*
-                (?:
-                    (?P<none_keyword> NONE )
-                        |
-                    (?P<root_keyword> ROOT )
-                        |
-                    (?P<queue_position_type> BEFORE | AFTER )
-                    [ ]
-                    [#] (?P<queue_reference_id> [a-z-.]+ )
-                        |
-                    (?P<invalid_value> [\s\S]*? )
-                )
-                [\s]*
-            ''',
-            string=attribute_value,
-            flags=re.ASCII | re.VERBOSE,
-        )
+        return ReplacementAuthority._QUEUE_POSITION_PATTERN.fullmatch(attribute_value)
 
     def stage_queue_position(self, replacement, attribute_value, rules_file_name, line_number_range_start, line_number):
         queue_position_match = ReplacementAuthority.compute_queue_position_match(attribute_value)
 
         invalid_value = queue_position_match.group('invalid_value')
         if invalid_value is not None:
-            ReplacementAuthority.print_error(
-                f'invalid value `{invalid_value}` for attribute `queue_position`',
+            raise RulesFileException(
+                f'invalid value `{truncate(invalid_value)}` for attribute `queue_position`',
                 rules_file_name,
                 line_number_range_start,
                 line_number,
             )
-            sys.exit(GENERIC_ERROR_EXIT_CODE)
 
         if queue_position_match.group('none_keyword') is not None:
             return
 
         if queue_position_match.group('root_keyword') is not None:
             if self._root_replacement_id is not None:
-                ReplacementAuthority.print_error(
+                raise RulesFileException(
                     f'root replacement already declared (`#{self._root_replacement_id}`)',
                     rules_file_name,
                     line_number_range_start,
                     line_number,
                 )
-                sys.exit(GENERIC_ERROR_EXIT_CODE)
 
             replacement.queue_position_type = 'ROOT'
             replacement.queue_reference_replacement = None
             return
 
         queue_position_type = queue_position_match.group('queue_position_type')
-        queue_reference_id = queue_position_match.group('queue_reference_id')
+        queue_reference_id = sys.intern(queue_position_match.group('queue_reference_id'))
 
         if queue_reference_id == replacement.id_:
-            ReplacementAuthority.print_error(
+            raise RulesFileException(
                 f'self-referential `queue_position`',
                 rules_file_name,
                 line_number_range_start,
                 line_number,
             )
-            sys.exit(GENERIC_ERROR_EXIT_CODE)
 
         try:
             queue_reference_replacement = self._replacement_from_id[queue_reference_id]
         except KeyError:
-            ReplacementAuthority.print_error(
+            raise RulesFileException(
                 f'undefined replacement `#{queue_reference_id}`',
                 rules_file_name,
                 line_number_range_start,
                 line_number,
             )
-            sys.exit(GENERIC_ERROR_EXIT_CODE)
 
-        if queue_reference_replacement not in self._replacement_queue:
-            ReplacementAuthority.print_error(
+        if queue_reference_id not in self._next_queued_id_from_id:
+            raise RulesFileException(
                 f'replacement `#{queue_reference_id}` not in queue',
                 rules_file_name,
                 line_number_range_start,
                 line_number,
             )
-            sys.exit(GENERIC_ERROR_EXIT_CODE)
 
         replacement.queue_position_type = queue_position_type
         replacement.queue_reference_replacement = queue_reference_replacement
 
+    _REPLACEMENT_PATTERN = re.compile(
+        pattern=r'''
+            (?P<whitespace_only> \A [\s]* \Z )
+                |
+            (?P<none_keyword> \A [\s]* NONE [\s]* \Z )
+                |
+            (?:
+                [#] (?P<id_> [a-z0-9-.]+ ) (?= [\s] | \Z )
+                    |
+                (?P<invalid_syntax> [\S]+ )
+            )
+            [\s]*
+        ''',
+        flags=re.ASCII | re.VERBOSE,
+    )
+
     @staticmethod
     def compute_replacement_matches(attribute_value):
-        return re.finditer(
-            pattern=r'''
-                (?P<whitespace_only> \A [\s]* \Z )
-                    |
-                (?P<none_keyword> \A [\s]* NONE [\s]* \Z )
-                    |
-                (?:
-                    [#] (?P<id_> [a-z0-9-.]+ ) (?= [\s] | \Z )
-                        |
-                    (?P<invalid_syntax> [\S]+ )
-                )
-                [\s]*
-            ''',
-            string=attribute_value,
-            flags=re.ASCII | re.VERBOSE,
-        )
+        return ReplacementAuthority._REPLACEMENT_PATTERN.finditer(attribute_value)
 
     def stage_replacements(self, replacement, attribute_value, rules_file_name, line_number_range_start, line_number):
         matched_replacements = []
 
         for replacement_match in ReplacementAuthority.compute_replacement_matches(attribute_value):
             if replacement_match.group('whitespace_only') is not None:
-                ReplacementAuthority.print_error(
+                raise RulesFileException(
                     f'invalid specification `` for attribute `replacements`',
                     rules_file_name,
                     line_number_range_start,
                     line_number,
                 )
-                sys.exit(GENERIC_ERROR_EXIT_CODE)
 
             invalid_syntax = replacement_match.group('invalid_syntax')
             if invalid_syntax is not None:
-                ReplacementAuthority.print_error(
-                    f'invalid specification `{invalid_syntax}` for attribute `replacements`',
+                raise RulesFileException(
+                    f'invalid specification `{truncate(invalid_syntax)}` for attribute `replacements`',
                     rules_file_name,
                     line_number_range_start,
                     line_number,
                 )
-                sys.exit(GENERIC_ERROR_EXIT_CODE)
 
             if replacement_match.group('none_keyword') is not None:
                 return
 
-            matched_replacement_id = replacement_match.group('id_')
+            matched_replacement_id = sys.intern(replacement_match.group('id_'))
             if matched_replacement_id == replacement.id_:
                 matched_replacement = replacement
             else:
                 try:
                     matched_replacement = self._replacement_from_id[matched_replacement_id]
                 except KeyError:
-                    ReplacementAuthority.print_error(
+                    raise RulesFileException(
                         f'undefined replacement `#{matched_replacement_id}`',
                         rules_file_name,
                         line_number_range_start,
                         line_number,
                     )
-                    sys.exit(GENERIC_ERROR_EXIT_CODE)
 
             matched_replacements.append(matched_replacement)
 
         replacement.replacements = matched_replacements
 
+    _STARTING_PATTERN_PATTERN = re.compile(
+        pattern=r'''
+            [\s]*
+            (?:
+                (?P<starting_pattern> [\S].*? )
+                    |
+                (?P<invalid_value> .*? )
+            )
+            [\s]*
+        ''',
+        flags=re.ASCII | re.DOTALL | re.VERBOSE,
+    )
+
     @staticmethod
     def compute_starting_pattern_match(attribute_value):
-        return re.fullmatch(
-            pattern=r'''
-                [\s]*
-                (?:
-                    (?P<starting_pattern> [\S][\s\S]*? )
-                        |
-                    (?P<invalid_value> [\s\S]*? )
-                )
-                [\s]*
-            ''',
-            string=attribute_value,
-            flags=re.ASCII | re.VERBOSE,
-        )
+        return ReplacementAuthority._STARTING_PATTERN_PATTERN.fullmatch(attribute_value)
 
     @staticmethod
     def stage_starting_pattern(replacement, attribute_value, rules_file_name, line_number_range_start, line_number):
@@ -1203,149 +1100,98 @@ class ReplacementAuthority:
 
         invalid_value = starting_pattern_match.group('invalid_value')
         if invalid_value is not None:
-            ReplacementAuthority.print_error(
-                f'invalid value `{invalid_value}` for attribute `starting_pattern`',
+            raise RulesFileException(
+                f'invalid value `{truncate(invalid_value)}` for attribute `starting_pattern`',
                 rules_file_name,
                 line_number_range_start,
                 line_number,
             )
-            sys.exit(GENERIC_ERROR_EXIT_CODE)
 
         starting_pattern = starting_pattern_match.group('starting_pattern')
 
         try:
-            starting_pattern_compiled = re.compile(pattern=starting_pattern, flags=re.ASCII | re.MULTILINE | re.VERBOSE)
+            starting_pattern_compiled = compile_pattern(
+                pattern=starting_pattern,
+                flags=re.ASCII | re.MULTILINE | re.VERBOSE,
+            )
         except re.error as pattern_exception:
-            ReplacementAuthority.print_error(
-                f'bad regex pattern `{starting_pattern}`',
+            raise RulesFileException(
+                f'bad regex pattern `{truncate(starting_pattern)}`',
                 rules_file_name,
                 line_number_range_start,
                 line_number,
-            )
-            ReplacementAuthority.print_traceback(pattern_exception)
-            sys.exit(GENERIC_ERROR_EXIT_CODE)
+            ) from pattern_exception
 
         if len(starting_pattern_compiled.groupindex) > 0:
-            ReplacementAuthority.print_error(
+            raise RulesFileException(
                 f'named capture groups not allowed in `starting_pattern`',
                 rules_file_name,
                 line_number_range_start,
                 line_number,
             )
-            sys.exit(GENERIC_ERROR_EXIT_CODE)
 
         replacement.starting_pattern = starting_pattern
 
-    @staticmethod
-    def compute_syntax_type_match(attribute_value):
-        return re.fullmatch(
-            pattern=r'''
-                [\s]*
-                (?:
-                    (?P<syntax_type> BLOCK | INLINE )
-                        |
-                    (?P<invalid_value> [\s\S]*? )
-                )
-                [\s]*
-            ''',
-            string=attribute_value,
-            flags=re.ASCII | re.VERBOSE,
-        )
-
     @staticmethod
     def stage_syntax_type(replacement, attribute_value, rules_file_name, line_number_range_start, line_number):
-        syntax_type_match = ReplacementAuthority.compute_syntax_type_match(attribute_value)
-
-        invalid_value = syntax_type_match.group('invalid_value')
-        if invalid_value is not None:
-            ReplacementAuthority.print_error(
-                f'invalid value `{invalid_value}` for attribute `syntax_type`',
-                rules_file_name,
-                line_number_range_start,
-                line_number,
-            )
-            sys.exit(GENERIC_ERROR_EXIT_CODE)
-
-        syntax_type = syntax_type_match.group('syntax_type')
-        replacement.syntax_type_is_block = syntax_type == 'BLOCK'
-
-    @staticmethod
-    def compute_tag_name_match(attribute_value):
-        return re.fullmatch(
-            pattern=r'''
-                [\s]*
-                (?:
-                    (?P<none_keyword> NONE )
-                        |
-                    (?P<tag_name> [a-z0-9]+ )
-                        |
-                    (?P<invalid_value> [\s\S]*? )
-                )
-                [\s]*
-            ''',
-            string=attribute_value,
-            flags=re.ASCII | re.VERBOSE,
+        syntax_type = ReplacementAuthority.extract_keyword(
+            attribute_value,
+            ('BLOCK', 'INLINE'),
+            'syntax_type',
+            rules_file_name,
+            line_number_range_start,
+            line_number,
         )
+        replacement.syntax_type_is_block = syntax_type == 'BLOCK'
 
     @staticmethod
     def stage_tag_name(replacement, attribute_value, rules_file_name, line_number_range_start, line_number):
-        tag_name_match = ReplacementAuthority.compute_tag_name_match(attribute_value)
+        tag_name = attribute_value.strip(string.whitespace)
 
-        invalid_value = tag_name_match.group('invalid_value')
-        if invalid_value is not None:
-            ReplacementAuthority.print_error(
-                f'invalid value `{invalid_value}` for attribute `tag_name`',
+        if tag_name == 'NONE':
+            return
+
+        if not ReplacementAuthority.is_nonempty_run_of(
+            tag_name,
+            ReplacementAuthority._TAG_NAME_CHARACTERS_DELETION_TABLE,
+        ):
+            raise RulesFileException(
+                f'invalid value `{truncate(tag_name)}` for attribute `tag_name`',
                 rules_file_name,
                 line_number_range_start,
                 line_number,
             )
-            sys.exit(GENERIC_ERROR_EXIT_CODE)
 
-        if tag_name_match.group('none_keyword') is not None:
-            return
-
-        tag_name = tag_name_match.group('tag_name')
         replacement.tag_name = tag_name
 
+    _SUBSTITUTION_DELIMITER_PATTERN = re.compile(pattern='[-]{2,}[>]')
+
     @staticmethod
     def compute_substitution_match(substitution):
-        substitution_delimiters = re.findall(pattern='[-]{2,}[>]', string=substitution)
+        substitution_delimiters = ReplacementAuthority._SUBSTITUTION_DELIMITER_PATTERN.findall(substitution)
         if len(substitution_delimiters) == 0:
             return None
 
-        longest_substitution_delimiter = max(substitution_delimiters, key=len)
-        return re.fullmatch(
+        longest_substitution_delimiter = max(substitution_delimiters, key=len)  # hyphens and `>`, no escape needed
+        return ReplacementAuthority.compile_substitution_pattern(longest_substitution_delimiter).fullmatch(substitution)
+
+    @staticmethod
+    def compile_substitution_pattern(substitution_delimiter):
+        return compile_pattern(
             pattern=fr'''
                 [\s]*
-                    (?:
-                        "(?P<double_quoted_pattern> [\s\S]*? )"
-                            |
-                        '(?P<single_quoted_pattern> [\s\S]*? )'
-                            |
-                        (?P<bare_pattern> [\s\S]*? )
-                    )
+                    (?P<pattern_quote> ["']? ) (?P<pattern> .*? ) (?P=pattern_quote)
                 [\s]*
-                    {re.escape(longest_substitution_delimiter)}
+                    {substitution_delimiter}
                     [\s]*
                     (?:
-                        (?P<cmd_version_keyword> CMD_VERSION )
-                            |
-                        (?P<cmd_name_keyword> CMD_NAME )
-                            |
-                        (?P<cmd_basename_keyword> CMD_BASENAME )
-                            |
-                        (?P<clean_url_keyword> CLEAN_URL )
-                            |
-                        "(?P<double_quoted_substitute> [\s\S]*? )"
-                            |
-                        '(?P<single_quoted_substitute> [\s\S]*? )'
+                        (?P<keyword> CMD_VERSION | CMD_NAME | CMD_BASENAME | CLEAN_URL )
                             |
-                        (?P<bare_substitute> [\s\S]*? )
+                        (?P<substitute_quote> ["']? ) (?P<substitute> .*? ) (?P=substitute_quote)
                     )
                 [\s]*
             ''',
-            string=substitution,
-            flags=re.ASCII | re.VERBOSE,
+            flags=re.ASCII | re.DOTALL | re.VERBOSE,
         )
 
     @staticmethod
@@ -1359,42 +1205,20 @@ class ReplacementAuthority:
     ):
         substitution_match = ReplacementAuthority.compute_substitution_match(substitution)
         if substitution_match is None:
-            ReplacementAuthority.print_error(
+            raise RulesFileException(
                 f'missing delimiter `-->` in substitution `{substitution}`',
                 rules_file_name,
                 line_number_range_start,
                 line_number,
             )
-            sys.exit(GENERIC_ERROR_EXIT_CODE)
 
-        double_quoted_pattern = substitution_match.group('double_quoted_pattern')
-        if double_quoted_pattern is not None:
-            pattern = double_quoted_pattern
-        else:
-            single_quoted_pattern = substitution_match.group('single_quoted_pattern')
-            if single_quoted_pattern is not None:
-                pattern = single_quoted_pattern
-            else:
-                pattern = substitution_match.group('bare_pattern')
-
-        if substitution_match.group('cmd_version_keyword') is not None:
-            substitute = __version__
-        elif substitution_match.group('cmd_name_keyword') is not None:
-            substitute = cmd_name
-        elif substitution_match.group('cmd_basename_keyword') is not None:
-            substitute = extract_basename(cmd_name)
-        elif substitution_match.group('clean_url_keyword') is not None:
-            substitute = make_clean_url(cmd_name)
+        pattern = substitution_match.group('pattern')
+
+        keyword = substitution_match.group('keyword')
+        if keyword is not None:
+            substitute = compute_keyword_substitute(keyword, cmd_name)
         else:
-            double_quoted_substitute = substitution_match.group('double_quoted_substitute')
-            if double_quoted_substitute is not None:
-                substitute = double_quoted_substitute
-            else:
-                single_quoted_substitute = substitution_match.group('single_quoted_substitute')
-                if single_quoted_substitute is not None:
-                    substitute = single_quoted_substitute
-                else:
-                    substitute = substitution_match.group('bare_substitute')
+            substitute = substitution_match.group('substitute')
 
         replacement.add_substitution(pattern, substitute)
 
@@ -1409,66 +1233,40 @@ class ReplacementAuthority:
     ):
         substitution_match = ReplacementAuthority.compute_substitution_match(substitution)
         if substitution_match is None:
-            ReplacementAuthority.print_error(
+            raise RulesFileException(
                 f'missing delimiter `-->` in substitution `{substitution}`',
                 rules_file_name,
                 line_number_range_start,
                 line_number,
             )
-            sys.exit(GENERIC_ERROR_EXIT_CODE)
 
-        double_quoted_pattern = substitution_match.group('double_quoted_pattern')
-        if double_quoted_pattern is not None:
-            pattern = double_quoted_pattern
-        else:
-            single_quoted_pattern = substitution_match.group('single_quoted_pattern')
-            if single_quoted_pattern is not None:
-                pattern = single_quoted_pattern
-            else:
-                pattern = substitution_match.group('bare_pattern')
-
-        if substitution_match.group('cmd_version_keyword') is not None:
-            substitute = escape_regex_substitute(__version__)
-        elif substitution_match.group('cmd_name_keyword') is not None:
-            substitute = escape_regex_substitute(cmd_name)
-        elif substitution_match.group('cmd_basename_keyword') is not None:
-            substitute = escape_regex_substitute(extract_basename(cmd_name))
-        elif substitution_match.group('clean_url_keyword') is not None:
-            substitute = escape_regex_substitute(make_clean_url(cmd_name))
+        pattern = substitution_match.group('pattern')
+
+        keyword = substitution_match.group('keyword')
+        if keyword is not None:
+            substitute = escape_regex_substitute(compute_keyword_substitute(keyword, cmd_name))
         else:
-            double_quoted_substitute = substitution_match.group('double_quoted_substitute')
-            if double_quoted_substitute is not None:
-                substitute = double_quoted_substitute
-            else:
-                single_quoted_substitute = substitution_match.group('single_quoted_substitute')
-                if single_quoted_substitute is not None:
-                    substitute = single_quoted_substitute
-                else:
-                    substitute = substitution_match.group('bare_substitute')
+            substitute = substitution_match.group('substitute')
 
         try:
-            pattern_compiled = re.compile(pattern=pattern, flags=re.ASCII | re.MULTILINE | re.VERBOSE)
+            pattern_compiled = compile_pattern(pattern=pattern, flags=re.ASCII | re.MULTILINE | re.VERBOSE)
         except re.error as pattern_exception:
-            ReplacementAuthority.print_error(
-                f'bad regex pattern `{pattern}`',
+            raise RulesFileException(
+                f'bad regex pattern `{truncate(pattern)}`',
                 rules_file_name,
                 line_number_range_start,
                 line_number,
-            )
-            ReplacementAuthority.print_traceback(pattern_exception)
-            sys.exit(GENERIC_ERROR_EXIT_CODE)
+            ) from pattern_exception
 
         try:
             re.sub(pattern=pattern_compiled, repl=substitute, string='')
         except re.error as substitute_exception:
-            ReplacementAuthority.print_error(
-                f'bad regex substitute `{substitute}` for pattern `{pattern}`',
+            raise RulesFileException(
+                f'bad regex substitute `{truncate(substitute)}` for pattern `{truncate(pattern)}`',
                 rules_file_name,
                 line_number_range_start,
                 line_number,
-            )
-            ReplacementAuthority.print_traceback(substitute_exception)
-            sys.exit(GENERIC_ERROR_EXIT_CODE)
+            ) from substitute_exception
 
         replacement.add_substitution(pattern, substitute)
 
@@ -1504,13 +1302,12 @@ class ReplacementAuthority:
                     line_number,
                 )
             else:
-                ReplacementAuthority.print_error(
+                raise RulesFileException(
                     f'class `{class_name}` does not allow substitutions',
                     rules_file_name,
                     line_number_range_start,
                     line_number,
                 )
-                sys.exit(GENERIC_ERROR_EXIT_CODE)
 
         else:  # staging an attribute declaration
             if attribute_name == 'allowed_flags':
@@ -1677,17 +1474,46 @@ class ReplacementAuthority:
         return None, None, None, None
         # attribute_name, attribute_value, substitution, line_number_range_start
 
+    def enqueue(self, id_, previous_id, next_id):
+        """
+        Link a replacement into the replacement queue between two adjacent queued replacements.
+
+        The queue is kept as a doubly linked list of ids (with None marking either end),
+        so that insertion relative to a queued replacement does not require finding its index.
+        """
+        self._previous_queued_id_from_id[id_] = previous_id
+        self._next_queued_id_from_id[id_] = next_id
+
+        if previous_id is None:
+            self._first_queued_id = id_
+        else:
+            self._next_queued_id_from_id[previous_id] = id_
+
+        if next_id is None:
+            self._last_queued_id = id_
+        else:
+            self._previous_queued_id_from_id[next_id] = id_
+
+    def compute_replacement_queue(self):
+        replacement_queue = []
+
+        id_ = self._first_queued_id
+        while id_ is not None:
+            replacement_queue.append(self._replacement_from_id[id_])
+            id_ = self._next_queued_id_from_id[id_]
+
+        return replacement_queue
+
     def commit(self, class_name, replacement, rules_file_name, line_number):
         try:
             replacement.commit()
         except MissingAttributeException as exception:
             missing_attribute = exception.missing_attribute
-            ReplacementAuthority.print_error(
+            raise RulesFileException(
                 f'missing attribute `{missing_attribute}` for {class_name}',
                 rules_file_name,
                 line_number,
             )
-            sys.exit(GENERIC_ERROR_EXIT_CODE)
 
         id_ = replacement.id_
         self._replacement_from_id[id_] = replacement
@@ -1697,25 +1523,111 @@ class ReplacementAuthority:
             pass
         elif queue_position_type == 'ROOT':
             self._root_replacement_id = id_
-            self._replacement_queue.append(replacement)
+            self.enqueue(id_, self._last_queued_id, None)
         else:
-            queue_reference_replacement = replacement.queue_reference_replacement
-            queue_reference_index = self._replacement_queue.index(queue_reference_replacement)
+            queue_reference_id = replacement.queue_reference_replacement.id_
             if queue_position_type == 'BEFORE':
-                insertion_index = queue_reference_index
+                self.enqueue(id_, self._previous_queued_id_from_id[queue_reference_id], queue_reference_id)
             elif queue_position_type == 'AFTER':
-                insertion_index = queue_reference_index + 1
-            else:
-                insertion_index = None
-            self._replacement_queue.insert(insertion_index, replacement)
+                self.enqueue(id_, queue_reference_id, self._next_queued_id_from_id[queue_reference_id])
 
         return None, None, None, None, None, None
         # class_name, replacement, attribute_name, attribute_value, substitution, line_number_range_start
 
+    def stage_pending(
+        self,
+        class_name,
+        replacement,
+        attribute_name,
+        attribute_value,
+        substitution,
+        rules_file_name,
+        cmd_name,
+        line_number_range_start,
+        line_number,
+    ):
+        if attribute_name is None and substitution is None:  # nothing to stage
+            return attribute_name, attribute_value, substitution, line_number_range_start
+
+        return self.stage(
+            class_name,
+            replacement,
+            attribute_name,
+            attribute_value,
+            substitution,
+            rules_file_name,
+            cmd_name,
+            line_number_range_start,
+            line_number,
+        )
+
+    def flush_pending(
+        self,
+        class_name,
+        replacement,
+        attribute_name,
+        attribute_value,
+        substitution,
+        rules_file_name,
+        cmd_name,
+        line_number_range_start,
+        line_number,
+    ):
+        attribute_name, attribute_value, substitution, line_number_range_start = (
+            self.stage_pending(
+                class_name,
+                replacement,
+                attribute_name,
+                attribute_value,
+                substitution,
+                rules_file_name,
+                cmd_name,
+                line_number_range_start,
+                line_number,
+            )
+        )
+
+        if replacement is None:  # nothing to commit
+            return class_name, replacement, attribute_name, attribute_value, substitution, line_number_range_start
+
+        return self.commit(class_name, replacement, rules_file_name, line_number)
+
+    @staticmethod
+    def classify_rules_lines(replacement_rules):
+        """
+        Lazily classify the lines of replacement rules.
+
+        Yields a pair («rules_line_type», «rules_line_match») for each line, where «rules_line_type» is
+        `whitespace_only`, `comment`, the `lastgroup` of a rules line match, or None for invalid syntax.
+        Classification is independent of any legislated state, so for rules that are legislated repeatedly
+        (i.e. STANDARD_RULES) it may be done once, and the list of pairs passed to `legislate` in place of the string.
+        """
+        # Bound once, rather than looked up on the class for every line
+        is_whitespace_only = ReplacementAuthority.is_whitespace_only
+        is_comment = ReplacementAuthority.is_comment
+        compute_rules_line_match = ReplacementAuthority.compute_rules_line_match
+
+        for line in iterate_lines(replacement_rules):
+            if is_whitespace_only(line):
+                yield 'whitespace_only', None
+            elif is_comment(line):
+                yield 'comment', None
+            else:
+                rules_line_match = compute_rules_line_match(line)
+                if rules_line_match is None:
+                    yield None, None
+                else:
+                    yield rules_line_match.lastgroup, rules_line_match
+
     def legislate(self, replacement_rules, rules_file_name, cmd_name):
         if replacement_rules is None:
             return
 
+        if isinstance(replacement_rules, str):
+            classified_rules_lines = ReplacementAuthority.classify_rules_lines(replacement_rules)
+        else:  # already classified
+            classified_rules_lines = replacement_rules
+
         class_name = None
         replacement = None
         attribute_name = None
@@ -1724,122 +1636,87 @@ class ReplacementAuthority:
         line_number_range_start = None
         line_number = 0
 
-        for line_number, line in enumerate(replacement_rules.splitlines(), start=1):
-            if ReplacementAuthority.is_whitespace_only(line):
-                if attribute_name is not None or substitution is not None:
-                    attribute_name, attribute_value, substitution, line_number_range_start = (
-                        self.stage(
-                            class_name,
-                            replacement,
-                            attribute_name,
-                            attribute_value,
-                            substitution,
-                            rules_file_name,
-                            cmd_name,
-                            line_number_range_start,
-                            line_number,
-                        )
-                    )
-                if replacement is not None:
-                    class_name, replacement, attribute_name, attribute_value, substitution, line_number_range_start = (
-                        self.commit(
-                            class_name,
-                            replacement,
-                            rules_file_name,
-                            line_number,
-                        )
-                    )
-                continue
-
-            if ReplacementAuthority.is_comment(line):
-                continue
-
-            rules_inclusion_match = ReplacementAuthority.compute_rules_inclusion_match(line)
-            if rules_inclusion_match is not None:
-                if attribute_name is not None or substitution is not None:
-                    attribute_name, attribute_value, substitution, line_number_range_start = (
-                        self.stage(
-                            class_name,
-                            replacement,
-                            attribute_name,
-                            attribute_value,
-                            substitution,
-                            rules_file_name,
-                            cmd_name,
-                            line_number_range_start,
-                            line_number,
-                        )
+        for line_number, (rules_line_type, rules_line_match) in enumerate(classified_rules_lines, start=1):
+            if rules_line_type == 'whitespace_only':
+                class_name, replacement, attribute_name, attribute_value, substitution, line_number_range_start = (
+                    self.flush_pending(
+                        class_name,
+                        replacement,
+                        attribute_name,
+                        attribute_value,
+                        substitution,
+                        rules_file_name,
+                        cmd_name,
+                        line_number_range_start,
+                        line_number,
                     )
-                if replacement is not None:
-                    class_name, replacement, attribute_name, attribute_value, substitution, line_number_range_start = (
-                        self.commit(
-                            class_name,
-                            replacement,
-                            rules_file_name,
-                            line_number,
-                        )
+                )
+            elif rules_line_type == 'comment':
+                pass
+            elif rules_line_type is None:
+                raise RulesFileException(
+                    'invalid syntax\n\n' + CMD_REPLACEMENT_SYNTAX_HELP,
+                    rules_file_name,
+                    line_number,
+                )
+            elif rules_line_type == 'rules_inclusion':
+                class_name, replacement, attribute_name, attribute_value, substitution, line_number_range_start = (
+                    self.flush_pending(
+                        class_name,
+                        replacement,
+                        attribute_name,
+                        attribute_value,
+                        substitution,
+                        rules_file_name,
+                        cmd_name,
+                        line_number_range_start,
+                        line_number,
                     )
+                )
                 self.process_rules_inclusion_line(
-                    rules_inclusion_match,
+                    rules_line_match,
                     rules_file_name,
                     cmd_name,
                     line_number,
                 )
-                continue
-
-            class_declaration_match = ReplacementAuthority.compute_class_declaration_match(line)
-            if class_declaration_match is not None:
-                if attribute_name is not None or substitution is not None:
-                    attribute_name, attribute_value, substitution, line_number_range_start = (
-                        self.stage(
-                            class_name,
-                            replacement,
-                            attribute_name,
-                            attribute_value,
-                            substitution,
-                            rules_file_name,
-                            cmd_name,
-                            line_number_range_start,
-                            line_number,
-                        )
-                    )
-                if replacement is not None:
-                    class_name, replacement, attribute_name, attribute_value, substitution, line_number_range_start = (
-                        self.commit(
-                            class_name,
-                            replacement,
-                            rules_file_name,
-                            line_number,
-                        )
+            elif rules_line_type == 'class_declaration':
+                class_name, replacement, attribute_name, attribute_value, substitution, line_number_range_start = (
+                    self.flush_pending(
+                        class_name,
+                        replacement,
+                        attribute_name,
+                        attribute_value,
+                        substitution,
+                        rules_file_name,
+                        cmd_name,
+                        line_number_range_start,
+                        line_number,
                     )
+                )
                 class_name, replacement, line_number_range_start = (
                     self.process_class_declaration_line(
-                        class_declaration_match,
+                        rules_line_match,
                         rules_file_name,
                         line_number,
                     )
                 )
-                continue
-
-            attribute_declaration_match = ReplacementAuthority.compute_attribute_declaration_match(line)
-            if attribute_declaration_match is not None:
-                if attribute_name is not None or substitution is not None:
-                    attribute_name, attribute_value, substitution, line_number_range_start = (
-                        self.stage(
-                            class_name,
-                            replacement,
-                            attribute_name,
-                            attribute_value,
-                            substitution,
-                            rules_file_name,
-                            cmd_name,
-                            line_number_range_start,
-                            line_number,
-                        )
+            elif rules_line_type == 'attribute_declaration':
+                attribute_name, attribute_value, substitution, line_number_range_start = (
+                    self.stage_pending(
+                        class_name,
+                        replacement,
+                        attribute_name,
+                        attribute_value,
+                        substitution,
+                        rules_file_name,
+                        cmd_name,
+                        line_number_range_start,
+                        line_number,
                     )
+                )
                 attribute_name, attribute_value, line_number_range_start = (
                     ReplacementAuthority.process_attribute_declaration_line(
-                        attribute_declaration_match,
+                        rules_line_match,
                         class_name,
                         replacement,
                         attribute_value,
@@ -1847,40 +1724,33 @@ class ReplacementAuthority:
                         line_number,
                     )
                 )
-                continue
-
-            substitution_declaration_match = ReplacementAuthority.compute_substitution_declaration_match(line)
-            if substitution_declaration_match is not None:
-                if attribute_name is not None or substitution is not None:
-                    attribute_name, attribute_value, substitution, line_number_range_start = (
-                        self.stage(
-                            class_name,
-                            replacement,
-                            attribute_name,
-                            attribute_value,
-                            substitution,
-                            rules_file_name,
-                            cmd_name,
-                            line_number_range_start,
-                            line_number,
-                        )
+            elif rules_line_type == 'substitution_declaration':
+                attribute_name, attribute_value, substitution, line_number_range_start = (
+                    self.stage_pending(
+                        class_name,
+                        replacement,
+                        attribute_name,
+                        attribute_value,
+                        substitution,
+                        rules_file_name,
+                        cmd_name,
+                        line_number_range_start,
+                        line_number,
                     )
+                )
                 substitution, line_number_range_start = (
                     ReplacementAuthority.process_substitution_declaration_line(
                         replacement,
-                        substitution_declaration_match,
+                        rules_line_match,
                         substitution,
                         rules_file_name,
                         line_number,
                     )
                 )
-                continue
-
-            continuation_match = ReplacementAuthority.compute_continuation_match(line)
-            if continuation_match is not None:
+            elif rules_line_type == 'continuation':
                 attribute_value, substitution = (
                     ReplacementAuthority.process_continuation_line(
-                        continuation_match,
+                        rules_line_match,
                         attribute_name,
                         attribute_value,
                         substitution,
@@ -1888,57 +1758,110 @@ class ReplacementAuthority:
                         line_number,
                     )
                 )
-                continue
-
-            ReplacementAuthority.print_error(
-                'invalid syntax\n\n' + CMD_REPLACEMENT_SYNTAX_HELP,
-                rules_file_name,
-                line_number,
-            )
-            sys.exit(GENERIC_ERROR_EXIT_CODE)
 
         # At end of file
-        if attribute_name is not None or substitution is not None:
-            self.stage(
-                class_name,
-                replacement,
-                attribute_name,
-                attribute_value,
-                substitution,
-                rules_file_name,
-                cmd_name,
-                line_number_range_start,
-                line_number,
-            )
+        self.stage_pending(
+            class_name,
+            replacement,
+            attribute_name,
+            attribute_value,
+            substitution,
+            rules_file_name,
+            cmd_name,
+            line_number_range_start,
+            line_number,
+        )
         if replacement is not None:
             self.commit(class_name, replacement, rules_file_name, line_number + 1)
 
+    @staticmethod
+    def skip_discarded_replacements(replacement_queue, string):
+        """
+        Skip the replacements whose results would be discarded by a later replacement.
+
+        If a replacement discards its input (e.g. `* [\\s\\S]* -->`), the replacements before it need not be applied.
+        The only effect a replacement has beyond the string is the recording of reference definitions,
+        so this is not done if any replacement reachable from there on (including nested replacements)
+        defines or resolves references.
+        """
+        for index in reversed(range(len(replacement_queue))):
+            replacement = replacement_queue[index]
+            if isinstance(replacement, RegexDictionaryReplacement) and replacement.discards_input():
+                if any(
+                    isinstance(
+                        reachable,
+                        (ReferenceDefinitionReplacement, ReferencedImageReplacement, ReferencedLinkReplacement),
+                    )
+                    for reachable in ReplacementAuthority.iterate_reachable_replacements(replacement_queue[index:])
+                ):
+                    break
+
+                return replacement_queue[index:], ''
+
+        return replacement_queue, string
+
+    @staticmethod
+    def iterate_reachable_replacements(replacements):
+        """
+        Iterate over replacements and (recursively) those they apply, each once.
+        """
+        seen_ids = set()
+        pending_replacements = list(replacements)
+
+        while len(pending_replacements) > 0:
+            replacement = pending_replacements.pop()
+            if replacement.id_ in seen_ids:
+                continue
+
+            seen_ids.add(replacement.id_)
+            yield replacement
+
+            if isinstance(replacement, ReplacementSequence):
+                pending_replacements.extend(replacement.replacements)
+            if isinstance(replacement, ReplacementWithContentReplacements):
+                pending_replacements.extend(replacement.content_replacements)
+            if isinstance(replacement, ReplacementWithConcludingReplacements):
+                pending_replacements.extend(replacement.concluding_replacements)
+
     def execute(self, string):
+        replacement_queue = self.compute_replacement_queue()
+
         if self._verbose_mode_enabled:
             replacement_queue_ids = [
                 f'#{replacement.id_}'
-                for replacement in self._replacement_queue
+                for replacement in replacement_queue
             ]
             print(f'Replacement queue: {replacement_queue_ids}\n\n\n\n')
+        else:
+            replacement_queue, string = ReplacementAuthority.skip_discarded_replacements(replacement_queue, string)
 
-        for replacement in self._replacement_queue:
+        for replacement in replacement_queue:
             string = replacement.apply(string)
 
         return string
 
 
+def compute_keyword_substitute(keyword, cmd_name):
+    if keyword == 'CMD_VERSION':
+        return __version__
+    elif keyword == 'CMD_NAME':
+        return cmd_name
+    elif keyword == 'CMD_BASENAME':
+        return extract_basename(cmd_name)
+    elif keyword == 'CLEAN_URL':
+        return make_clean_url(cmd_name)
+
+
 def escape_regex_substitute(substitute):
     return substitute.replace('\\', r'\\')
 
 
 def extract_basename(name):
-    return re.sub(pattern=r'\A .* [/]', repl='', string=name, flags=re.VERBOSE)
+    return name.rsplit('/', 1)[-1]
 
 
 def make_clean_url(cmd_name):
-    return re.sub(
-        pattern=r'(?P<last_separator> \A | [/] ) index \Z',
-        repl=r'\g<last_separator>',
-        string=cmd_name,
-        flags=re.VERBOSE,
-    )
+    if cmd_name == 'index' or cmd_name.endswith('/index'):
+        return cmd_name[:-len('index')]
+
+    return cmd_name
@@ -106,32 +106,33 @@ class Replacement(abc.ABC):
             if negative_flag_name is not None and negative_flag_name in enabled_flag_names:
                 return string
 
+        if not self._verbose_mode_enabled:
+            return self._apply(string)
+
         string_before = string
-        string = self._apply(string)
-        string_after = string
-
-        if self._verbose_mode_enabled:
-            if string_before == string_after:
-                no_change_indicator = ' (no change)'
-            else:
-                no_change_indicator = ''
-
-            try:
-                print('<' * VERBOSE_MODE_DIVIDER_SYMBOL_COUNT + f' BEFORE #{self._id}')
-                print(string_before)
-                print('=' * VERBOSE_MODE_DIVIDER_SYMBOL_COUNT + no_change_indicator)
-                print(string_after)
-                print('>' * VERBOSE_MODE_DIVIDER_SYMBOL_COUNT + f' AFTER #{self._id}')
-                print('\n\n\n\n')
-            except UnicodeEncodeError as unicode_encode_error:
-                # caused by Private Use Area code points used for placeholders
-                error_message = (
-                    'bad print due to non-Unicode terminal encoding, likely `cp1252` on Git BASH for Windows. '
-                    'Try setting the `PYTHONIOENCODING` environment variable to `utf-8` '
-                    '(add `export PYTHONIOENCODING=utf-8` to `.bash_profile` and then source it). '
-                    'See <https://stackoverflow.com/a/7865013>.'
-                )
-                raise FileNotFoundError(error_message) from unicode_encode_error
+        string_after = self._apply(string)
+
+        if string_before == string_after:
+            no_change_indicator = ' (no change)'
+        else:
+            no_change_indicator = ''
+
+        try:
+            print('<' * VERBOSE_MODE_DIVIDER_SYMBOL_COUNT + f' BEFORE #{self._id}')
+            print(string_before)
+            print('=' * VERBOSE_MODE_DIVIDER_SYMBOL_COUNT + no_change_indicator)
+            print(string_after)
+            print('>' * VERBOSE_MODE_DIVIDER_SYMBOL_COUNT + f' AFTER #{self._id}')
+            print('\n\n\n\n')
+        except UnicodeEncodeError as unicode_encode_error:
+            # caused by Private Use Area code points used for placeholders
+            error_message = (
+                'bad print due to non-Unicode terminal encoding, likely `cp1252` on Git BASH for Windows. '
+                'Try setting the `PYTHONIOENCODING` environment variable to `utf-8` '
+                '(add `export PYTHONIOENCODING=utf-8` to `.bash_profile` and then source it). '
+                'See <https://stackoverflow.com/a/7865013>.'
+            )
+            raise FileNotFoundError(error_message) from unicode_encode_error
 
         return string_after
 
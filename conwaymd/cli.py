@@ -7,13 +7,21 @@ Command-line interface.
 """
 
 import argparse
+import concurrent.futures
+import functools
+import hashlib
 import os
 import re
 import sys
+import tempfile
+import traceback
 
 from conwaymd._version import __version__
 from conwaymd.constants import COMMAND_LINE_ERROR_EXIT_CODE, GENERIC_ERROR_EXIT_CODE
 from conwaymd.core import cmd_to_html
+from conwaymd.exceptions import RulesFileException
+
+CACHE_DIRECTORY_NAME = '.cmd_cache'
 
 DESCRIPTION = '''
     Convert Conway-Markdown (CMD) to HTML.
@@ -28,12 +36,47 @@ ALL_MODE_HELP = '''
 VERBOSE_MODE_HELP = '''
     run in verbose mode (prints every replacement applied)
 '''
+JOB_COUNT_HELP = '''
+    number of CMD files to convert in parallel with -a
+    (default 1; 0 for one per CPU; if parallel, messages appear in order of completion)
+'''
+CACHE_MODE_HELP = f'''
+    reuse HTML cached in `{CACHE_DIRECTORY_NAME}/` for unchanged CMD files
+    (changes to included rules files are not detected)
+'''
+
+_CMD_EXTENSION_PATTERN = re.compile(pattern=r'[.](cmd)? \Z', flags=re.VERBOSE)
 
 
 def is_cmd_file(file_name):
     return file_name.endswith('.cmd')
 
 
+def iterate_cmd_file_names(directory_name):
+    """
+    Recursively iterate over the names of CMD files under a directory.
+
+    As with `os.walk`, symbolic links to directories are not followed,
+    and unreadable directories (or entries that cannot be examined) are skipped.
+    """
+    try:
+        directory_entries = list(os.scandir(directory_name))
+    except OSError:
+        return
+
+    for directory_entry in directory_entries:
+        try:
+            is_directory = directory_entry.is_dir()
+            is_walkable_directory = is_directory and not directory_entry.is_symlink()
+        except OSError:
+            continue
+
+        if is_walkable_directory:
+            yield from iterate_cmd_file_names(directory_entry.path)
+        elif not is_directory and is_cmd_file(directory_entry.name):
+            yield directory_entry.path
+
+
 def extract_cmd_name(cmd_file_name_argument):
     """
     Extract name-without-extension from a CMD file name argument.
@@ -42,7 +85,7 @@ def extract_cmd_name(cmd_file_name_argument):
     The path is normalised by resolving `./` and `../`.
     """
     cmd_file_name_argument = os.path.normpath(cmd_file_name_argument)
-    cmd_name = re.sub(pattern=r'[.](cmd)? \Z', repl='', string=cmd_file_name_argument, flags=re.VERBOSE)
+    cmd_name = _CMD_EXTENSION_PATTERN.sub(repl='', string=cmd_file_name_argument)
 
     return cmd_name
 
@@ -66,6 +109,20 @@ def parse_command_line_arguments():
         action='store_true',
         help=VERBOSE_MODE_HELP,
     )
+    argument_parser.add_argument(
+        '-j', '--jobs',
+        dest='job_count',
+        default=None,
+        help=JOB_COUNT_HELP,
+        metavar='N',
+        type=int,
+    )
+    argument_parser.add_argument(
+        '-c', '--cache',
+        dest='cache_mode_enabled',
+        action='store_true',
+        help=CACHE_MODE_HELP,
+    )
     argument_parser.add_argument(
         'cmd_file_name_arguments',
         default=[],
@@ -77,7 +134,55 @@ def parse_command_line_arguments():
     return argument_parser.parse_args()
 
 
-def generate_html_file(cmd_file_name_argument, verbose_mode_enabled, uses_command_line_argument):
+def compute_cache_file_name(cmd, cmd_file_name):
+    """
+    Compute the name of the file caching the HTML for a CMD file.
+
+    The key covers the version, since the standard rules may change between versions,
+    and the CMD file name, since the output depends on it via `CMD_NAME` etc.
+    """
+    cache_key = '\0'.join([__version__, cmd_file_name, cmd])
+    cache_key_digest = hashlib.sha256(cache_key.encode('utf-8')).hexdigest()
+    return os.path.join(CACHE_DIRECTORY_NAME, f'{cache_key_digest}.html')
+
+
+def read_cached_html(cache_file_name):
+    try:
+        with open(cache_file_name, 'r', encoding='utf-8') as cache_file:
+            return cache_file.read()
+    except OSError:
+        return None
+
+
+def write_cached_html(cache_file_name, html):
+    """
+    Write HTML to the cache.
+
+    The HTML is written to a temporary file first and then moved into place,
+    so that an interrupted write never leaves a truncated entry to be served later.
+    """
+    temporary_file_name = None
+    try:
+        os.makedirs(CACHE_DIRECTORY_NAME, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            mode='w',
+            encoding='utf-8',
+            dir=CACHE_DIRECTORY_NAME,
+            suffix='.tmp',
+            delete=False,
+        ) as temporary_file:
+            temporary_file_name = temporary_file.name
+            temporary_file.write(html)
+        os.replace(temporary_file_name, cache_file_name)
+    except OSError:  # caching is best-effort
+        if temporary_file_name is not None:
+            try:
+                os.remove(temporary_file_name)
+            except OSError:
+                pass
+
+
+def generate_html_file(cmd_file_name_argument, verbose_mode_enabled, uses_command_line_argument, cache_enabled=False):
     cmd_name = extract_cmd_name(cmd_file_name_argument)
     cmd_file_name = f'{cmd_name}.cmd'
     try:
@@ -91,7 +196,25 @@ def generate_html_file(cmd_file_name_argument, verbose_mode_enabled, uses_comman
             error_message = f'file `{cmd_file_name}` not found for `{cmd_file_name}` in cmd_file_name_list'
             raise FileNotFoundError(error_message) from file_not_found_error
 
-    html = cmd_to_html(cmd, cmd_file_name, verbose_mode_enabled)
+    if cache_enabled and not verbose_mode_enabled:
+        cache_file_name = compute_cache_file_name(cmd, cmd_file_name)
+        html = read_cached_html(cache_file_name)
+    else:
+        cache_file_name = None
+        html = None
+
+    if html is None:
+        try:
+            html = cmd_to_html(cmd, cmd_file_name, verbose_mode_enabled)
+        except RulesFileException as rules_file_exception:
+            print(f'error: {rules_file_exception}', file=sys.stderr)
+            cause = rules_file_exception.__cause__
+            if cause is not None:  # bad regex pattern or substitute
+                traceback.print_exception(type(cause), cause, cause.__traceback__)
+            sys.exit(GENERIC_ERROR_EXIT_CODE)
+
+        if cache_file_name is not None:
+            write_cached_html(cache_file_name, html)
 
     html_file_name = f'{cmd_name}.html'
     try:
@@ -108,24 +231,56 @@ def main():
     cmd_file_name_arguments = parsed_arguments.cmd_file_name_arguments
     all_mode_enabled = parsed_arguments.all_mode_enabled
     verbose_mode_enabled = parsed_arguments.verbose_mode_enabled
+    job_count = parsed_arguments.job_count
+    cache_mode_enabled = parsed_arguments.cache_mode_enabled
+
+    if job_count is None:
+        job_count = 1
+    elif not all_mode_enabled:
+        print('error: option -j (or --jobs) can only be used with option -a (or --all)', file=sys.stderr)
+        sys.exit(COMMAND_LINE_ERROR_EXIT_CODE)
+    elif job_count < 0:
+        print('error: option -j (or --jobs) cannot be negative', file=sys.stderr)
+        sys.exit(COMMAND_LINE_ERROR_EXIT_CODE)
 
     if all_mode_enabled:
         if len(cmd_file_name_arguments) > 0:
             print('error: option -a (or --all) cannot be used with positional argument', file=sys.stderr)
             sys.exit(COMMAND_LINE_ERROR_EXIT_CODE)
 
-        cmd_file_names = [
-            os.path.join(path, file_name)
-            for path, _, file_names in os.walk(os.curdir)
-            for file_name in file_names
-            if is_cmd_file(file_name)
-        ]
-        for cmd_file_name in sorted(cmd_file_names):
-            generate_html_file(cmd_file_name, verbose_mode_enabled, uses_command_line_argument=False)
+        cmd_file_names = sorted(iterate_cmd_file_names(os.curdir))
+
+        if job_count == 1:
+            for cmd_file_name in cmd_file_names:
+                generate_html_file(
+                    cmd_file_name,
+                    verbose_mode_enabled,
+                    uses_command_line_argument=False,
+                    cache_enabled=cache_mode_enabled,
+                )
+        else:
+            generate_html_file_in_all_mode = functools.partial(
+                generate_html_file,
+                verbose_mode_enabled=verbose_mode_enabled,
+                uses_command_line_argument=False,
+                cache_enabled=cache_mode_enabled,
+            )
+            with concurrent.futures.ProcessPoolExecutor(max_workers=job_count or None) as executor:
+                try:
+                    for _ in executor.map(generate_html_file_in_all_mode, cmd_file_names):
+                        pass  # consume results, so that an exit in a worker propagates
+                except BaseException:  # as in serial mode, convert no further files after a failure
+                    executor.shutdown(cancel_futures=True)
+                    raise
 
     else:
         for cmd_file_name_argument in cmd_file_name_arguments:
-            generate_html_file(cmd_file_name_argument, verbose_mode_enabled, uses_command_line_argument=True)
+            generate_html_file(
+                cmd_file_name_argument,
+                verbose_mode_enabled,
+                uses_command_line_argument=True,
+                cache_enabled=cache_mode_enabled,
+            )
 
 
 if __name__ == '__main__':
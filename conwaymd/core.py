@@ -23,6 +23,20 @@ from conwaymd.authorities import ReplacementAuthority
 from conwaymd.constants import STANDARD_RULES
 from conwaymd.utilities import none_to_empty_string
 
+_RULES_AND_CONTENT_PATTERN = re.compile(
+    pattern=r'''
+        (?:
+            (?P<replacement_rules> [\s\S]*? )
+            (?P<delimiter> ^ [%]{3,} )
+            \n
+        ) ?
+        (?P<main_content> [\s\S]* )
+    ''',
+    flags=re.ASCII | re.MULTILINE | re.VERBOSE,
+)
+_CMD_EXTENSION_PATTERN = re.compile(pattern=r'[.](cmd) \Z', flags=re.VERBOSE)
+_STANDARD_RULES_CLASSIFIED = tuple(ReplacementAuthority.classify_rules_lines(STANDARD_RULES))
+
 
 def extract_rules_and_content(cmd):
     """
@@ -38,18 +52,7 @@ def extract_rules_and_content(cmd):
             «main_content»
     according to the first occurrence of «delimiter».
     """
-    match = re.fullmatch(
-        pattern=r'''
-            (?:
-                (?P<replacement_rules> [\s\S]*? )
-                (?P<delimiter> ^ [%]{3,} )
-                \n
-            ) ?
-            (?P<main_content> [\s\S]* )
-        ''',
-        string=cmd,
-        flags=re.ASCII | re.MULTILINE | re.VERBOSE,
-    )
+    match = _RULES_AND_CONTENT_PATTERN.fullmatch(cmd)
 
     replacement_rules = match.group('replacement_rules')
     main_content = match.group('main_content')
@@ -58,7 +61,7 @@ def extract_rules_and_content(cmd):
 
 
 def extract_separator_normalised_cmd_name(cmd_file_name):
-    cmd_name = re.sub(pattern=r'[.](cmd) \Z', repl='', string=none_to_empty_string(cmd_file_name), flags=re.VERBOSE)
+    cmd_name = _CMD_EXTENSION_PATTERN.sub(repl='', string=none_to_empty_string(cmd_file_name))
     separator_normalised_cmd_name = cmd_name.replace('\\', '/')
 
     return separator_normalised_cmd_name
@@ -74,7 +77,7 @@ def cmd_to_html(cmd, cmd_file_name, verbose_mode_enabled=False):
 
     replacement_master = ReplacementAuthority(cmd_file_name, verbose_mode_enabled)
     replacement_master.legislate(
-        STANDARD_RULES,
+        _STANDARD_RULES_CLASSIFIED,
         rules_file_name='STANDARD_RULES',
         cmd_name=separator_normalised_cmd_name,
     )
@@ -7,6 +7,7 @@ Classes for CMD replacement rules that are actually exposed to the user via CMD
 """
 
 import copy
+import itertools
 import re
 
 from conwaymd.bases import (
@@ -35,7 +36,7 @@ from conwaymd.idioms import (
     build_uri_regex,
 )
 from conwaymd.placeholders import PlaceholderMaster
-from conwaymd.utilities import de_indent, none_to_empty_string
+from conwaymd.utilities import compile_pattern, compute_longest_common_prefix, de_indent
 
 
 class ReplacementSequence(Replacement):
@@ -229,7 +230,6 @@ class OrdinaryDictionaryReplacement(
         super().__init__(id_, verbose_mode_enabled)
         self._apply_substitutions_simultaneously = True
         self._simultaneous_regex_pattern_compiled = None
-        self._simultaneous_substitute_function = None
 
     def attribute_names(self):
         return (
@@ -265,38 +265,85 @@ class OrdinaryDictionaryReplacement(
             return self.sequential_apply(string)
 
     def set_simultaneous_apply_method_variables(self):
-        self._simultaneous_regex_pattern_compiled = re.compile(
+        self._simultaneous_regex_pattern_compiled = compile_pattern(
             pattern=OrdinaryDictionaryReplacement.build_simultaneous_regex_pattern(self._substitute_from_pattern),
         )
-        self._simultaneous_substitute_function = (
-            self.build_simultaneous_substitute_function(self._substitute_from_pattern)
-        )
+
+    _TRIE_PATTERN_COUNT_MIN = 16
 
     @staticmethod
     def build_simultaneous_regex_pattern(substitute_from_pattern):
+        """
+        Build the regex pattern matching any of the patterns.
+
+        For large dictionaries, the patterns are factored into a trie so that the regex engine
+        tries one branch per character rather than every pattern at every candidate position.
+        This is only done when no pattern is a prefix of another,
+        since otherwise the dictionary order decides which pattern matches.
+        """
+        if len(substitute_from_pattern) >= OrdinaryDictionaryReplacement._TRIE_PATTERN_COUNT_MIN:
+            sorted_patterns = sorted(substitute_from_pattern)
+            if not any(
+                next_pattern.startswith(pattern)
+                for pattern, next_pattern in zip(sorted_patterns, sorted_patterns[1:])
+            ):
+                return OrdinaryDictionaryReplacement.build_trie_regex_pattern(sorted_patterns)
+
         return '|'.join(
             re.escape(pattern)
             for pattern in substitute_from_pattern
         )
 
+    @staticmethod
+    def build_trie_regex_pattern(sorted_patterns):
+        """
+        Build a trie-factored regex pattern from sorted, non-empty patterns, none a prefix of another.
+        """
+        alternatives = []
+        for _, patterns_iterator in itertools.groupby(sorted_patterns, key=lambda pattern: pattern[0]):
+            patterns = list(patterns_iterator)
+            prefix = compute_longest_common_prefix(patterns)
+            if len(patterns) == 1:
+                alternatives.append(re.escape(prefix))
+            else:
+                suffixes = [pattern[len(prefix):] for pattern in patterns]
+                suffixes_regex = OrdinaryDictionaryReplacement.build_trie_regex_pattern(suffixes)
+                alternatives.append(f'{re.escape(prefix)}{suffixes_regex}')
+
+        if len(alternatives) == 1:
+            return alternatives[0]
+
+        return f'(?:{"|".join(alternatives)})'
+
     def build_simultaneous_substitute_function(self, substitute_from_pattern):
+        """
+        Build the substitute function for one application.
+
+        Since there are finitely many patterns, the concluded substitute for each is computed once
+        (on first occurrence) and then reused, rather than rerunning concluding replacements on every match.
+        """
+        concluded_substitute_from_pattern = {}
+
         def substitute_function(match):
             pattern = match.group()
-            substitute = substitute_from_pattern[pattern]
+            concluded_substitute = concluded_substitute_from_pattern.get(pattern)
+            if concluded_substitute is not None:
+                return concluded_substitute
 
+            substitute = substitute_from_pattern[pattern]
             for replacement in self._concluding_replacements:
                 substitute = replacement.apply(substitute)
 
+            concluded_substitute_from_pattern[pattern] = substitute
             return substitute
 
         return substitute_function
 
     def simultaneous_apply(self, string):
         if len(self._substitute_from_pattern) > 0:
-            string = re.sub(
-                pattern=self._simultaneous_regex_pattern_compiled,
-                repl=self._simultaneous_substitute_function,
-                string=string,
+            string = self._simultaneous_regex_pattern_compiled.sub(
+                self.build_simultaneous_substitute_function(self._substitute_from_pattern),
+                string,
             )
 
         return string
@@ -339,7 +386,7 @@ class RegexDictionaryReplacement(
     """
     def __init__(self, id_, verbose_mode_enabled):
         super().__init__(id_, verbose_mode_enabled)
-        self._substitute_function_from_pattern = {}
+        self._repl_from_pattern_compiled = {}
 
     def attribute_names(self):
         return (
@@ -349,22 +396,36 @@ class RegexDictionaryReplacement(
             'concluding_replacements',
         )
 
+    _CATCH_ALL_PATTERNS = (r'[\s\S]*', r'[\S\s]*')
+
     def _validate_mandatory_attributes(self):
         pass
 
+    def discards_input(self):
+        """
+        Whether the result is independent of the input string.
+
+        This is (conservatively) the case when the first substitution deletes a catch-all pattern
+        and there are no concluding replacements, whereupon every string is first reduced to the empty string.
+        """
+        if len(self._substitute_from_pattern) == 0 or len(self._concluding_replacements) > 0:
+            return False
+
+        pattern, substitute = next(iter(self._substitute_from_pattern.items()))
+        return pattern.strip() in RegexDictionaryReplacement._CATCH_ALL_PATTERNS and substitute == ''
+
     def _set_apply_method_variables(self):
         for pattern, substitute in self._substitute_from_pattern.items():
-            substitute_function = self.build_substitute_function(substitute)
-            self._substitute_function_from_pattern[pattern] = substitute_function
+            pattern_compiled = compile_pattern(pattern=pattern, flags=re.ASCII | re.MULTILINE | re.VERBOSE)
+            if len(self._concluding_replacements) > 0:
+                repl = self.build_substitute_function(substitute)
+            else:
+                repl = substitute  # template expanded by `re` itself, without a Python-level call per match
+            self._repl_from_pattern_compiled[pattern_compiled] = repl
 
     def _apply(self, string):
-        for pattern, substitute_function in self._substitute_function_from_pattern.items():
-            string = re.sub(
-                pattern=pattern,
-                repl=substitute_function,
-                string=string,
-                flags=re.ASCII | re.MULTILINE | re.VERBOSE,
-            )
+        for pattern_compiled, repl in self._repl_from_pattern_compiled.items():
+            string = pattern_compiled.sub(repl=repl, string=string)
 
         return string
 
@@ -462,7 +523,7 @@ class FixedDelimitersReplacement(
 
     def _set_apply_method_variables(self):
         self._has_flags = len(self._flag_name_from_letter) > 0
-        self._regex_pattern_compiled = re.compile(
+        self._regex_pattern_compiled = compile_pattern(
             pattern=FixedDelimitersReplacement.build_regex_pattern(
                 self._syntax_type_is_block,
                 self._flag_name_from_letter,
@@ -482,11 +543,7 @@ class FixedDelimitersReplacement(
         )
 
     def _apply(self, string):
-        return re.sub(
-            pattern=self._regex_pattern_compiled,
-            repl=self._substitute_function,
-            string=string,
-        )
+        return self._regex_pattern_compiled.sub(repl=self._substitute_function, string=string)
 
     @staticmethod
     def build_regex_pattern(
@@ -528,7 +585,7 @@ class FixedDelimitersReplacement(
                 combined_attribute_specifications = (
                     attribute_specifications
                     + ' '
-                    + none_to_empty_string(matched_attribute_specifications)
+                    + (matched_attribute_specifications or '')
                 )
                 attributes_sequence = build_attributes_sequence(combined_attribute_specifications, use_protection=True)
             else:
@@ -658,7 +715,7 @@ class ExtensibleFenceReplacement(
 
     def _set_apply_method_variables(self):
         self._has_flags = len(self._flag_name_from_letter) > 0
-        self._regex_pattern_compiled = re.compile(
+        self._regex_pattern_compiled = compile_pattern(
             pattern=ExtensibleFenceReplacement.build_regex_pattern(
                 self._syntax_type_is_block,
                 self._flag_name_from_letter,
@@ -680,11 +737,7 @@ class ExtensibleFenceReplacement(
         )
 
     def _apply(self, string):
-        return re.sub(
-            pattern=self._regex_pattern_compiled,
-            repl=self._substitute_function,
-            string=string,
-        )
+        return self._regex_pattern_compiled.sub(repl=self._substitute_function, string=string)
 
     @staticmethod
     def build_regex_pattern(
@@ -734,7 +787,7 @@ class ExtensibleFenceReplacement(
                 combined_attribute_specifications = (
                     attribute_specifications
                     + ' '
-                    + none_to_empty_string(matched_attribute_specifications)
+                    + (matched_attribute_specifications or '')
                 )
                 attributes_sequence = build_attributes_sequence(combined_attribute_specifications, use_protection=True)
             else:
@@ -826,7 +879,7 @@ class PartitioningReplacement(
             raise MissingAttributeException('starting_pattern')
 
     def _set_apply_method_variables(self):
-        self._regex_pattern_compiled = re.compile(
+        self._regex_pattern_compiled = compile_pattern(
             pattern=PartitioningReplacement.build_regex_pattern(
                 self._starting_pattern,
                 self._attribute_specifications,
@@ -837,11 +890,7 @@ class PartitioningReplacement(
         self._substitute_function = self.build_substitute_function(self._attribute_specifications, self._tag_name)
 
     def _apply(self, string):
-        return re.sub(
-            pattern=self._regex_pattern_compiled,
-            repl=self._substitute_function,
-            string=string,
-        )
+        return self._regex_pattern_compiled.sub(repl=self._substitute_function, string=string)
 
     @staticmethod
     def build_regex_pattern(starting_pattern, attribute_specifications, ending_pattern):
@@ -899,7 +948,7 @@ class PartitioningReplacement(
                 combined_attribute_specifications = (
                     attribute_specifications
                     + ' '
-                    + none_to_empty_string(matched_attribute_specifications)
+                    + (matched_attribute_specifications or '')
                 )
                 attributes_sequence = build_attributes_sequence(combined_attribute_specifications, use_protection=True)
             else:
@@ -970,7 +1019,7 @@ class InlineAssortedDelimitersReplacement(
             raise MissingAttributeException('delimiter_conversion')
 
     def _set_apply_method_variables(self):
-        self._regex_pattern_compiled = re.compile(
+        self._regex_pattern_compiled = compile_pattern(
             pattern=InlineAssortedDelimitersReplacement.build_regex_pattern(
                 self._tag_name_from_delimiter_length_from_character,
                 self._attribute_specifications,
@@ -987,7 +1036,7 @@ class InlineAssortedDelimitersReplacement(
         string_has_changed = True
 
         while string_has_changed:
-            new_string = re.sub(pattern=self._regex_pattern_compiled, repl=self._substitute_function, string=string)
+            new_string = self._regex_pattern_compiled.sub(repl=self._substitute_function, string=string)
             string_has_changed = new_string != string
             string = new_string
 
@@ -1005,7 +1054,7 @@ class InlineAssortedDelimitersReplacement(
                 combined_attribute_specifications = (
                     attribute_specifications
                     + ' '
-                    + none_to_empty_string(matched_attribute_specifications)
+                    + (matched_attribute_specifications or '')
                 )
                 attributes_sequence = build_attributes_sequence(combined_attribute_specifications, use_protection=True)
             else:
@@ -1127,18 +1176,14 @@ class HeadingReplacement(
         pass
 
     def _set_apply_method_variables(self):
-        self._regex_pattern_compiled = re.compile(
+        self._regex_pattern_compiled = compile_pattern(
             pattern=HeadingReplacement.build_regex_pattern(self._attribute_specifications),
             flags=re.ASCII | re.MULTILINE | re.VERBOSE,
         )
         self._substitute_function = HeadingReplacement.build_substitute_function(self._attribute_specifications)
 
     def _apply(self, string):
-        return re.sub(
-            pattern=self._regex_pattern_compiled,
-            repl=self._substitute_function,
-            string=string,
-        )
+        return self._regex_pattern_compiled.sub(repl=self._substitute_function, string=string)
 
     @staticmethod
     def build_regex_pattern(attribute_specifications):
@@ -1178,7 +1223,7 @@ class HeadingReplacement(
                 combined_attribute_specifications = (
                     attribute_specifications
                     + ' '
-                    + none_to_empty_string(matched_attribute_specifications)
+                    + (matched_attribute_specifications or '')
                 )
                 attributes_sequence = build_attributes_sequence(combined_attribute_specifications, use_protection=True)
             else:
@@ -1186,7 +1231,7 @@ class HeadingReplacement(
 
             content_starter = match.group('content_starter')
             content_continuation = match.group('content_continuation')
-            content = none_to_empty_string(content_starter) + content_continuation
+            content = (content_starter or '') + content_continuation
 
             substitute = f'<{tag_name}{attributes_sequence}>{content}</{tag_name}>'
 
@@ -1225,18 +1270,14 @@ class ReferenceDefinitionReplacement(
         pass
 
     def _set_apply_method_variables(self):
-        self._regex_pattern_compiled = re.compile(
+        self._regex_pattern_compiled = compile_pattern(
             pattern=ReferenceDefinitionReplacement.build_regex_pattern(self._attribute_specifications),
             flags=re.ASCII | re.MULTILINE | re.VERBOSE,
         )
         self._substitute_function = self.build_substitute_function(self._attribute_specifications)
 
     def _apply(self, string):
-        return re.sub(
-            pattern=self._regex_pattern_compiled,
-            repl=self._substitute_function,
-            string=string,
-        )
+        return self._regex_pattern_compiled.sub(repl=self._substitute_function, string=string)
 
     @staticmethod
     def build_regex_pattern(attribute_specifications):
@@ -1276,7 +1317,7 @@ class ReferenceDefinitionReplacement(
                 combined_attribute_specifications = (
                     attribute_specifications
                     + ' '
-                    + none_to_empty_string(matched_attribute_specifications)
+                    + (matched_attribute_specifications or '')
                 )
             else:
                 combined_attribute_specifications = ''
@@ -1332,7 +1373,7 @@ class SpecifiedImageReplacement(
         pass
 
     def _set_apply_method_variables(self):
-        self._regex_pattern_compiled = re.compile(
+        self._regex_pattern_compiled = compile_pattern(
             pattern=SpecifiedImageReplacement.build_regex_pattern(
                 self._attribute_specifications,
                 self._prohibited_content_regex,
@@ -1342,11 +1383,7 @@ class SpecifiedImageReplacement(
         self._substitute_function = SpecifiedImageReplacement.build_substitute_function(self._attribute_specifications)
 
     def _apply(self, string):
-        return re.sub(
-            pattern=self._regex_pattern_compiled,
-            repl=self._substitute_function,
-            string=string,
-        )
+        return self._regex_pattern_compiled.sub(repl=self._substitute_function, string=string)
 
     @staticmethod
     def build_regex_pattern(attribute_specifications, prohibited_content_regex):
@@ -1392,7 +1429,7 @@ class SpecifiedImageReplacement(
             else:
                 src = match.group('bare_uri')
 
-            src_protected = PlaceholderMaster.protect(none_to_empty_string(src))
+            src_protected = PlaceholderMaster.protect(src or '')
             src_attribute_specification = f'src={src_protected}'
 
             double_quoted_title = match.group('double_quoted_title')
@@ -1418,7 +1455,7 @@ class SpecifiedImageReplacement(
                 combined_attribute_specifications = ' '.join([
                     alt_src_title_attribute_specifications,
                     attribute_specifications,
-                    none_to_empty_string(matched_attribute_specifications),
+                    matched_attribute_specifications or '',
                 ])
             else:
                 combined_attribute_specifications = alt_src_title_attribute_specifications
@@ -1465,7 +1502,7 @@ class ReferencedImageReplacement(
         pass
 
     def _set_apply_method_variables(self):
-        self._regex_pattern_compiled = re.compile(
+        self._regex_pattern_compiled = compile_pattern(
             pattern=ReferencedImageReplacement.build_regex_pattern(
                 self._attribute_specifications,
                 self._prohibited_content_regex,
@@ -1475,11 +1512,7 @@ class ReferencedImageReplacement(
         self._substitute_function = self.build_substitute_function(self._attribute_specifications)
 
     def _apply(self, string):
-        return re.sub(
-            pattern=self._regex_pattern_compiled,
-            repl=self._substitute_function,
-            string=string,
-        )
+        return self._regex_pattern_compiled.sub(repl=self._substitute_function, string=string)
 
     @staticmethod
     def build_regex_pattern(attribute_specifications, prohibited_content_regex):
@@ -1522,7 +1555,7 @@ class ReferencedImageReplacement(
             except UnrecognisedLabelException:
                 return match.group()
 
-            src_protected = PlaceholderMaster.protect(none_to_empty_string(src))
+            src_protected = PlaceholderMaster.protect(src or '')
             src_attribute_specification = f'src={src_protected}'
 
             if title is not None:
@@ -1535,7 +1568,7 @@ class ReferencedImageReplacement(
                 alt_attribute_specification,
                 src_attribute_specification,
                 title_attribute_specification,
-                none_to_empty_string(referenced_attribute_specifications)
+                referenced_attribute_specifications or ''
             ])
 
             if attribute_specifications is not None:
@@ -1543,7 +1576,7 @@ class ReferencedImageReplacement(
                 combined_attribute_specifications = ' '.join([
                     alt_src_title_referenced_attribute_specifications,
                     attribute_specifications,
-                    none_to_empty_string(matched_attribute_specifications),
+                    matched_attribute_specifications or '',
                 ])
             else:
                 combined_attribute_specifications = alt_src_title_referenced_attribute_specifications
@@ -1596,7 +1629,7 @@ class ExplicitLinkReplacement(
 
     def _set_apply_method_variables(self):
         self._has_flags = len(self._flag_name_from_letter) > 0
-        self._regex_pattern_compiled = re.compile(
+        self._regex_pattern_compiled = compile_pattern(
             pattern=ExplicitLinkReplacement.build_regex_pattern(
                 self._flag_name_from_letter,
                 self._has_flags,
@@ -1611,11 +1644,7 @@ class ExplicitLinkReplacement(
         )
 
     def _apply(self, string):
-        return re.sub(
-            pattern=self._regex_pattern_compiled,
-            repl=self._substitute_function,
-            string=string,
-        )
+        return self._regex_pattern_compiled.sub(repl=self._substitute_function, string=string)
 
     @staticmethod
     def build_regex_pattern(flag_name_from_letter, has_flags, attribute_specifications):
@@ -1649,7 +1678,7 @@ class ExplicitLinkReplacement(
                 matched_attribute_specifications = match.group('attribute_specifications')
                 combined_attribute_specifications = ' '.join([
                     href_attribute_specification,
-                    none_to_empty_string(matched_attribute_specifications),
+                    matched_attribute_specifications or '',
                 ])
             else:
                 combined_attribute_specifications = href_attribute_specification
@@ -1701,7 +1730,7 @@ class SpecifiedLinkReplacement(
         pass
 
     def _set_apply_method_variables(self):
-        self._regex_pattern_compiled = re.compile(
+        self._regex_pattern_compiled = compile_pattern(
             pattern=SpecifiedLinkReplacement.build_regex_pattern(
                 self._attribute_specifications,
                 self._prohibited_content_regex,
@@ -1711,11 +1740,7 @@ class SpecifiedLinkReplacement(
         self._substitute_function = SpecifiedLinkReplacement.build_substitute_function(self._attribute_specifications)
 
     def _apply(self, string):
-        return re.sub(
-            pattern=self._regex_pattern_compiled,
-            repl=self._substitute_function,
-            string=string,
-        )
+        return self._regex_pattern_compiled.sub(repl=self._substitute_function, string=string)
 
     @staticmethod
     def build_regex_pattern(attribute_specifications, prohibited_content_regex):
@@ -1785,7 +1810,7 @@ class SpecifiedLinkReplacement(
                 combined_attribute_specifications = ' '.join([
                     href_title_attribute_specifications,
                     attribute_specifications,
-                    none_to_empty_string(matched_attribute_specifications),
+                    matched_attribute_specifications or '',
                 ])
             else:
                 combined_attribute_specifications = href_title_attribute_specifications
@@ -1832,7 +1857,7 @@ class ReferencedLinkReplacement(
         pass
 
     def _set_apply_method_variables(self):
-        self._regex_pattern_compiled = re.compile(
+        self._regex_pattern_compiled = compile_pattern(
             pattern=ReferencedLinkReplacement.build_regex_pattern(
                 self._attribute_specifications,
                 self._prohibited_content_regex,
@@ -1842,11 +1867,7 @@ class ReferencedLinkReplacement(
         self._substitute_function = self.build_substitute_function(self._attribute_specifications)
 
     def _apply(self, string):
-        return re.sub(
-            pattern=self._regex_pattern_compiled,
-            repl=self._substitute_function,
-            string=string,
-        )
+        return self._regex_pattern_compiled.sub(repl=self._substitute_function, string=string)
 
     @staticmethod
     def build_regex_pattern(attribute_specifications, prohibited_content_regex):
@@ -1900,7 +1921,7 @@ class ReferencedLinkReplacement(
             href_title_referenced_attribute_specifications = ' '.join([
                 href_attribute_specification,
                 title_attribute_specification,
-                none_to_empty_string(referenced_attribute_specifications)
+                referenced_attribute_specifications or ''
             ])
 
             if attribute_specifications is not None:
@@ -1908,7 +1929,7 @@ class ReferencedLinkReplacement(
                 combined_attribute_specifications = ' '.join([
                     href_title_referenced_attribute_specifications,
                     attribute_specifications,
-                    none_to_empty_string(matched_attribute_specifications),
+                    matched_attribute_specifications or '',
                 ])
             else:
                 combined_attribute_specifications = href_title_referenced_attribute_specifications
@@ -20,6 +20,49 @@ class MissingAttributeException(Exception):
         return self._missing_attribute
 
 
+class RulesFileException(Exception):
+    """
+    An error in CMD replacement rules, located by file name and line number range.
+
+    The range runs from `start_line_number` up to but not including `end_line_number`;
+    if `end_line_number` is None, the error is located at `start_line_number` alone.
+    """
+    def __init__(self, message, rules_file_name, start_line_number, end_line_number=None):
+        super().__init__(message, rules_file_name, start_line_number, end_line_number)
+        self._message = message
+        self._rules_file_name = rules_file_name
+        self._start_line_number = start_line_number
+        self._end_line_number = end_line_number
+
+    @property
+    def message(self):
+        return self._message
+
+    @property
+    def rules_file_name(self):
+        return self._rules_file_name
+
+    @property
+    def start_line_number(self):
+        return self._start_line_number
+
+    @property
+    def end_line_number(self):
+        return self._end_line_number
+
+    def __str__(self):
+        source_file = f'`{self._rules_file_name}`'
+
+        start_line_number = self._start_line_number
+        end_line_number = self._end_line_number
+        if end_line_number is None or start_line_number == end_line_number - 1:
+            line_number_range = f'line {start_line_number}'
+        else:
+            line_number_range = f'lines {start_line_number} to {end_line_number - 1}'
+
+        return f'{source_file}, {line_number_range}: {self._message}'
+
+
 class UncommittedApplyException(Exception):
     pass
 
@@ -6,7 +6,9 @@ Licensed under "MIT No Attribution" (MIT-0), see LICENSE.
 Common idioms.
 """
 
+import functools
 import re
+import string
 
 from conwaymd.placeholders import PlaceholderMaster
 from conwaymd.utilities import escape_attribute_value_html
@@ -62,43 +64,50 @@ BLOCK_TAG_NAMES = [
     'thead',
     'ul',
 ]
+_BLOCK_TAG_NAME_REGEX = '|'.join(re.escape(tag_name) for tag_name in BLOCK_TAG_NAMES)
+_AFTER_BLOCK_TAG_NAME_REGEX = fr'[\s{PlaceholderMaster.MARKER}>]'
 
 
-def compute_attribute_specification_matches(attribute_specifications):
-    return re.finditer(
-        pattern=r'''
-            [\s]*
+_ATTRIBUTE_SPECIFICATION_PATTERN = re.compile(
+    pattern=r'''
+        [\s]*
+        (?:
+            (?P<name> [^\s=]+ ) =
             (?:
-                (?P<name> [^\s=]+ ) =
-                (?:
-                    "(?P<double_quoted_value> [\s\S]*? )"
-                        |
-                    '(?P<single_quoted_value> [\s\S]*? )'
-                        |
-                    (?P<bare_value> [\S]* )
-                )
-                    |
-                [#] (?P<id_> [^\s"]+ )
-                    |
-                [.] (?P<class_> [^\s"]+ )
-                    |
-                [r] (?P<rowspan> [0-9]+ )
-                    |
-                [c] (?P<colspan> [0-9]+ )
+                "(?P<double_quoted_value> [\s\S]*? )"
                     |
-                [w] (?P<width> [0-9]+ )
+                '(?P<single_quoted_value> [\s\S]*? )'
                     |
-                [h] (?P<height> [0-9]+ )
-                    |
-                [-] (?P<delete_name> [\S]+ )
-                    |
-                (?P<boolean_name> [\S]+ )
-            ) ?
-            [\s]*
-        ''',
-        string=attribute_specifications,
-        flags=re.ASCII | re.VERBOSE,
-    )
+                (?P<bare_value> [\S]* )
+            )
+                |
+            [#] (?P<id_> [^\s"]+ )
+                |
+            [.] (?P<class_> [^\s"]+ )
+                |
+            [r] (?P<rowspan> [0-9]+ )
+                |
+            [c] (?P<colspan> [0-9]+ )
+                |
+            [w] (?P<width> [0-9]+ )
+                |
+            [h] (?P<height> [0-9]+ )
+                |
+            [-] (?P<delete_name> [\S]+ )
+                |
+            (?P<boolean_name> [\S]+ )
+        ) ?
+        [\s]*
+    ''',
+    flags=re.ASCII | re.VERBOSE,
+)
+
+
+_PROTECTED_EMPTY_ATTRIBUTES_SEQUENCE = PlaceholderMaster.protect('')
+
+
+def compute_attribute_specification_matches(attribute_specifications):
+    return _ATTRIBUTE_SPECIFICATION_PATTERN.finditer(attribute_specifications)
 
 
 def extract_attribute_name_and_value(attribute_specification_match):
@@ -111,54 +120,54 @@ def extract_attribute_name_and_value(attribute_specification_match):
     - («name»,) for an attribute to be omitted
     - None for an invalid attribute specification
     """
-    name = attribute_specification_match.group('name')
+    (
+        name,
+        double_quoted_value,
+        single_quoted_value,
+        bare_value,
+        id_,
+        class_,
+        rowspan,
+        colspan,
+        width,
+        height,
+        delete_name,
+        boolean_name,
+    ) = attribute_specification_match.groups()
+
     if name is not None:
-        try:
-            name = ATTRIBUTE_NAME_FROM_ABBREVIATION[name]
-        except KeyError:
-            pass
+        name = ATTRIBUTE_NAME_FROM_ABBREVIATION.get(name, name)
 
-        double_quoted_value = attribute_specification_match.group('double_quoted_value')
         if double_quoted_value is not None:
             return name, double_quoted_value
 
-        single_quoted_value = attribute_specification_match.group('single_quoted_value')
         if single_quoted_value is not None:
             return name, single_quoted_value
 
-        bare_value = attribute_specification_match.group('bare_value')
         if bare_value is not None:
             return name, bare_value
 
-    id_ = attribute_specification_match.group('id_')
     if id_ is not None:
         return 'id', id_
 
-    class_ = attribute_specification_match.group('class_')
     if class_ is not None:
         return 'class', class_
 
-    rowspan = attribute_specification_match.group('rowspan')
     if rowspan is not None:
         return 'rowspan', rowspan
 
-    colspan = attribute_specification_match.group('colspan')
     if colspan is not None:
         return 'colspan', colspan
 
-    width = attribute_specification_match.group('width')
     if width is not None:
         return 'width', width
 
-    height = attribute_specification_match.group('height')
     if height is not None:
         return 'height', height
 
-    delete_name = attribute_specification_match.group('delete_name')
     if delete_name is not None:
         return delete_name,
 
-    boolean_name = attribute_specification_match.group('boolean_name')
     if boolean_name is not None:
         return boolean_name, None
 
@@ -196,7 +205,12 @@ def build_attributes_sequence(attribute_specifications, use_protection=False):
     except when `class` is specified multiple times, in which case the values will be appended.
     For example, `id=x #y .a .b name=value .=c class="d"` shall be converted to the attribute sequence
     ` id="y" class="a b c d" name="value"`.
+    A boolean `class` discards the class values before it, so that `.a class` gives ` class`
+    and `.a class .b` gives ` class="b"`.
     """
+    if attribute_specifications.strip(string.whitespace) == '':  # by far the most common case
+        return _PROTECTED_EMPTY_ATTRIBUTES_SEQUENCE if use_protection else ''
+
     attribute_value_from_name = {}
 
     for attribute_specification_match in compute_attribute_specification_matches(attribute_specifications):
@@ -205,18 +219,23 @@ def build_attributes_sequence(attribute_specifications, use_protection=False):
         if name_and_value is None:  # invalid attribute specification
             continue
 
-        try:
-            name, value = name_and_value
-            if name == 'class':
-                try:
-                    attribute_value_from_name['class'] += f' {value}'
-                except KeyError:
-                    attribute_value_from_name['class'] = value
-            else:
-                attribute_value_from_name[name] = value
-        except ValueError:  # attribute to be omitted
+        if len(name_and_value) == 1:  # attribute to be omitted
             name, = name_and_value
             attribute_value_from_name.pop(name, None)
+            continue
+
+        name, value = name_and_value
+        if name == 'class' and value is not None:
+            if attribute_value_from_name.get('class') is None:
+                class_values = []
+                attribute_value_from_name['class'] = class_values  # joined after the loop
+            class_values.append(value)
+        else:
+            attribute_value_from_name[name] = value
+
+    class_values = attribute_value_from_name.get('class')
+    if class_values is not None:
+        attribute_value_from_name['class'] = ' '.join(class_values)
 
     attribute_sequence = ''
 
@@ -234,10 +253,9 @@ def build_attributes_sequence(attribute_specifications, use_protection=False):
     return attribute_sequence
 
 
+@functools.lru_cache(maxsize=None)
 def build_block_tag_regex(require_anchoring):
-    block_tag_name_regex = '|'.join(re.escape(tag_name) for tag_name in BLOCK_TAG_NAMES)
-    after_tag_name_regex = fr'[\s{PlaceholderMaster.MARKER}>]'
-    block_tag_regex = f'[<] [/]? (?: {block_tag_name_regex} ) {after_tag_name_regex}'
+    block_tag_regex = f'[<] [/]? (?: {_BLOCK_TAG_NAME_REGEX} ) {_AFTER_BLOCK_TAG_NAME_REGEX}'
 
     if require_anchoring:
         block_anchoring_regex = build_block_anchoring_regex(syntax_type_is_block=True)
@@ -246,6 +264,7 @@ def build_block_tag_regex(require_anchoring):
         return block_tag_regex
 
 
+@functools.lru_cache(maxsize=None)
 def build_block_anchoring_regex(syntax_type_is_block, capture_anchoring_whitespace=False):
     if syntax_type_is_block:
         if capture_anchoring_whitespace:
@@ -271,13 +290,15 @@ def build_flags_regex(allowed_flags, has_flags):
     return f'(?P<flags> [{flag_letters}]* )'
 
 
+@functools.lru_cache(maxsize=None)
 def build_extensible_delimiter_opening_regex(extensible_delimiter_character, extensible_delimiter_min_length):
     character_regex = re.escape(extensible_delimiter_character)
     repetition_regex = f'{{{extensible_delimiter_min_length},}}'
 
-    return f'(?P<extensible_delimiter> {character_regex}{repetition_regex} )'
+    return f'(?P<extensible_delimiter>{character_regex}{repetition_regex})'
 
 
+@functools.lru_cache(maxsize=None)
 def build_attribute_specifications_regex(
     attribute_specifications,
     require_newline,
@@ -313,6 +334,7 @@ def build_captured_character_class_regex(characters, capture_group_name):
     return f'(?P<{capture_group_name}> {character_class_regex} )'
 
 
+@functools.lru_cache(maxsize=None)
 def build_content_regex(
     prohibited_content_regex=None,
     permitted_content_regex=r'[\s\S]',
@@ -336,6 +358,7 @@ def build_extensible_delimiter_closing_regex():
     return '(?P=extensible_delimiter)'
 
 
+@functools.lru_cache(maxsize=None)
 def build_uri_regex(be_greedy):
     if be_greedy:
         greed = ''
@@ -347,3 +370,7 @@ def build_uri_regex(be_greedy):
 
 def build_title_regex():
     return r'''(?: "(?P<double_quoted_title> [^"]*? )" | '(?P<single_quoted_title> [^']*? )' )'''
+
+
+BLOCK_TAG_REGEX = build_block_tag_regex(require_anchoring=False)
+ANCHORED_BLOCK_TAG_REGEX = build_block_tag_regex(require_anchoring=True)
@@ -43,6 +43,12 @@ class PlaceholderMaster:
     _RUN_CODE_POINT_MIN = ord(_RUN_CHARACTER_MIN)
     _REPLACEMENT_CODE_POINT = ord(_REPLACEMENT_CHARACTER)
 
+    _MARKER_PLACEHOLDER = '\uF8FF\uE0EF\uE0A3\uE0BF\uF8FF'  # placeholder for «marker», whose UTF-8 is EF A3 BF
+
+    # Tables between bytes (as Latin-1 code points) and run characters
+    _RUN_CHARACTER_FROM_BYTE_TABLE = dict(zip(range(0x100), range(_RUN_CODE_POINT_MIN, _RUN_CODE_POINT_MIN + 0x100)))
+    _BYTE_FROM_RUN_CHARACTER_TABLE = dict(zip(range(_RUN_CODE_POINT_MIN, _RUN_CODE_POINT_MIN + 0x100), range(0x100)))
+
     _PLACEHOLDER_PATTERN_COMPILED = re.compile(
         pattern=f'{MARKER} (?P<run_characters> [{_RUN_CHARACTER_MIN}-{_RUN_CHARACTER_MAX}]* ) {MARKER}',
         flags=re.VERBOSE,
@@ -51,10 +57,7 @@ class PlaceholderMaster:
     @staticmethod
     def _unprotect_substitute_function(placeholder_match):
         run_characters = placeholder_match.group('run_characters')
-        string_bytes = bytes(
-            ord(character) - PlaceholderMaster._RUN_CODE_POINT_MIN
-            for character in run_characters
-        )
+        string_bytes = run_characters.translate(PlaceholderMaster._BYTE_FROM_RUN_CHARACTER_TABLE).encode('latin-1')
 
         try:
             string = string_bytes.decode()
@@ -84,11 +87,7 @@ class PlaceholderMaster:
         It just so happens that the act of replacing occurrences
         of «marker» is equivalent to protecting them with a placeholder.
         """
-        return re.sub(
-            pattern=PlaceholderMaster.MARKER,
-            repl=PlaceholderMaster.protect(PlaceholderMaster.MARKER),
-            string=string,
-        )
+        return string.replace(PlaceholderMaster.MARKER, PlaceholderMaster._MARKER_PLACEHOLDER)
 
     @staticmethod
     def protect(string):
@@ -97,12 +96,10 @@ class PlaceholderMaster:
         """
         marker = PlaceholderMaster.MARKER
 
-        string = PlaceholderMaster.unprotect(string)
+        if marker in string:  # no placeholders to be restored otherwise
+            string = PlaceholderMaster.unprotect(string)
         string_bytes = string.encode()
-        run_characters = ''.join(
-            chr(byte + PlaceholderMaster._RUN_CODE_POINT_MIN)
-            for byte in string_bytes
-        )
+        run_characters = string_bytes.decode('latin-1').translate(PlaceholderMaster._RUN_CHARACTER_FROM_BYTE_TABLE)
 
         placeholder = f'{marker}{run_characters}{marker}'
 
@@ -113,8 +110,7 @@ class PlaceholderMaster:
         """
         Unprotect a string by restoring placeholders to their strings.
         """
-        return re.sub(
-            pattern=PlaceholderMaster._PLACEHOLDER_PATTERN_COMPILED,
+        return PlaceholderMaster._PLACEHOLDER_PATTERN_COMPILED.sub(
             repl=PlaceholderMaster._unprotect_substitute_function,
             string=string,
         )
@@ -19,6 +19,8 @@ class Reference:
     - «title»
     where «uri» is `href` for links and `src` for images.
     """
+    __slots__ = ('_attribute_specifications', '_uri', '_title')
+
     def __init__(self, attribute_specifications, uri, title):
         self._attribute_specifications = attribute_specifications
         self._uri = uri
@@ -6,20 +6,64 @@ Licensed under "MIT No Attribution" (MIT-0), see LICENSE.
 Common utility functions.
 """
 
+import functools
 import re
 
+_TRAILING_WHITESPACE_LINE_PATTERN = re.compile(pattern=r'^ [^\S\n]+ \Z', flags=re.ASCII | re.MULTILINE | re.VERBOSE)
+_LINE_BOUNDARY_PATTERN = re.compile(pattern='\r\n|[\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029]')  # as `str.splitlines`
+_INDENTATION_PATTERN = re.compile(pattern=r'^ [^\S\n]+ | ^ (?! $ )', flags=re.ASCII | re.MULTILINE | re.VERBOSE)
+_UNESCAPED_AMPERSAND_PATTERN = re.compile(
+    pattern='''
+        [&]
+        (?!
+            (?:
+                [a-zA-Z]{1,31}
+                    |
+                [#] (?: [0-9]{1,7} | [xX] [0-9a-fA-F]{1,6} )
+            )
+            [;]
+        )
+    ''',
+    flags=re.VERBOSE,
+)
+_ATTRIBUTE_VALUE_HTML_ESCAPE_TABLE = str.maketrans({'<': '&lt;', '>': '&gt;', '"': '&quot;'})
+
 
 def compute_longest_common_prefix(strings):
-    shortest_string = min(strings, key=len, default='')
+    """
+    Compute the longest common prefix of a list of strings.
+
+    Only the lexicographically least and greatest strings need comparing,
+    since every string sorted between them shares whatever prefix they have in common.
+    """
+    if len(strings) == 0:
+        return ''
+
+    least_string = min(strings)
+    greatest_string = max(strings)
 
-    prefix = shortest_string
-    while len(prefix) > 0:
-        if all(string.startswith(prefix) for string in strings):
-            break
+    for index, character in enumerate(least_string):
+        if character != greatest_string[index]:
+            return least_string[:index]
 
-        prefix = prefix[:-1]
+    return least_string
 
-    return prefix
+
+@functools.lru_cache(maxsize=1024)
+def compile_pattern(pattern, flags=0):
+    """
+    Compile a regex pattern, caching the result.
+
+    The cache is bounded, lest patterns from document-defined rules accumulate over many conversions.
+    The patterns of the standard rules (several dozen) are used in every conversion,
+    so they stay compiled however many CMD files are converted.
+    """
+    return re.compile(pattern=pattern, flags=flags)
+
+
+@functools.lru_cache(maxsize=256)
+def compile_indentation_pattern(indentation):
+    return re.compile(pattern=f'^ {re.escape(indentation)}', flags=re.MULTILINE | re.VERBOSE)
 
 
 def de_indent(string):
@@ -34,25 +78,11 @@ def de_indent(string):
     of whitespace on all whitespace-only lines,
     even those lines which are not the last line.
     """
-    string = re.sub(
-        pattern=r'^ [^\S\n]+ \Z',
-        repl='',
-        string=string,
-        flags=re.ASCII | re.MULTILINE | re.VERBOSE,
-    )
-    indentations = re.findall(
-        pattern=r'^ [^\S\n]+ | ^ (?! $ )',
-        string=string,
-        flags=re.ASCII | re.MULTILINE | re.VERBOSE,
-    )
+    string = _TRAILING_WHITESPACE_LINE_PATTERN.sub(repl='', string=string)
+    indentations = _INDENTATION_PATTERN.findall(string)
     longest_common_indentation = compute_longest_common_prefix(indentations)
 
-    string = re.sub(
-        pattern=f'^ {re.escape(longest_common_indentation)}',
-        repl='',
-        string=string,
-        flags=re.MULTILINE | re.VERBOSE,
-    )
+    string = compile_indentation_pattern(longest_common_indentation).sub(repl='', string=string)
 
     return string
 
@@ -68,31 +98,42 @@ def escape_attribute_value_html(value):
     - Decimal code points are any run of up to 7 digits.
     - Hexadecimal code points are any run of up to 6 digits.
     """
-    value = re.sub(
-        pattern='''
-            [&]
-            (?!
-                (?:
-                    [a-zA-Z]{1,31}
-                        |
-                    [#] (?: [0-9]{1,7} | [xX] [0-9a-fA-F]{1,6} )
-                )
-                [;]
-            )
-        ''',
-        repl='&amp;',
-        string=value,
-        flags=re.VERBOSE,
-    )
-    value = re.sub(pattern='<', repl='&lt;', string=value)
-    value = re.sub(pattern='>', repl='&gt;', string=value)
-    value = re.sub(pattern='"', repl='&quot;', string=value)
+    value = _UNESCAPED_AMPERSAND_PATTERN.sub(repl='&amp;', string=value)
+    value = value.translate(_ATTRIBUTE_VALUE_HTML_ESCAPE_TABLE)
 
     return value
 
 
+def iterate_lines(string):
+    """
+    Lazily iterate over the lines of a string, without line terminators.
+
+    Lines are split exactly as by `str.splitlines`.
+    """
+    start_index = 0
+
+    for line_boundary_match in _LINE_BOUNDARY_PATTERN.finditer(string):
+        yield string[start_index:line_boundary_match.start()]
+        start_index = line_boundary_match.end()
+
+    if start_index < len(string):
+        yield string[start_index:]
+
+
 def none_to_empty_string(string):
     if string is None:
         return ''
 
     return string
+
+
+def truncate(string, max_length=80):
+    """
+    Truncate a string to at most `max_length` characters, marking any truncation with a trailing ellipsis.
+
+    Used to keep error messages short when quoting arbitrarily long content from rules files.
+    """
+    if len(string) <= max_length:
+        return string
+
+    return string[:max_length - 3] + '...'
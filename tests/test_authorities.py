@@ -8,18 +8,49 @@ Perform unit testing for `authorities.py`.
 
 import unittest
 
-from conwaymd.authorities import extract_basename, make_clean_url
+from conwaymd.authorities import ReplacementAuthority, extract_basename, make_clean_url
 
 
 class TestAuthorities(unittest.TestCase):
+    def test_replacement_authority_classify_rules_lines(self):
+        replacement_rules = '''\
+# comment
+OrdinaryDictionaryReplacement: #x
+- queue_position: ROOT
+* a --> b
+    continued
+
+< included.cmdr
+invalid
+'''
+        self.assertEqual(
+            [
+                rules_line_type
+                for rules_line_type, _ in ReplacementAuthority.classify_rules_lines(replacement_rules)
+            ],
+            [
+                'comment',
+                'class_declaration',
+                'attribute_declaration',
+                'substitution_declaration',
+                'continuation',
+                'whitespace_only',
+                'rules_inclusion',
+                None,
+            ],
+        )
+
     def test_extract_basename(self):
         self.assertEqual(extract_basename('path/to/cmd_name'), 'cmd_name')
+        self.assertEqual(extract_basename('cmd_name'), 'cmd_name')
+        self.assertEqual(extract_basename('/cmd_name'), 'cmd_name')
 
     def test_make_clean_url(self):
         self.assertEqual(make_clean_url('index'), '')
         self.assertEqual(make_clean_url('/index'), '/')
         self.assertEqual(make_clean_url('path/to/index'), 'path/to/')
         self.assertEqual(make_clean_url('/not-truly-index'), '/not-truly-index')
+        self.assertEqual(make_clean_url('not-truly-index'), 'not-truly-index')
 
 
 if __name__ == '__main__':
@@ -6,13 +6,35 @@ Licensed under "MIT No Attribution" (MIT-0), see LICENSE.
 Perform unit testing for `cli.py`.
 """
 
+import contextlib
+import io
 import os
+import tempfile
 import unittest
+from unittest import mock
 
-from conwaymd.cli import extract_cmd_name, is_cmd_file
+from conwaymd.cli import (
+    CACHE_DIRECTORY_NAME,
+    compute_cache_file_name,
+    extract_cmd_name,
+    generate_html_file,
+    is_cmd_file,
+    iterate_cmd_file_names,
+    main,
+)
+from conwaymd.constants import COMMAND_LINE_ERROR_EXIT_CODE
+from conwaymd.core import cmd_to_html
 
 
 class TestCli(unittest.TestCase):
+    def test_compute_cache_file_name(self):
+        cache_file_name = compute_cache_file_name('content', 'file.cmd')
+        self.assertTrue(cache_file_name.startswith('.cmd_cache'))
+        self.assertTrue(cache_file_name.endswith('.html'))
+        self.assertEqual(cache_file_name, compute_cache_file_name('content', 'file.cmd'))
+        self.assertNotEqual(cache_file_name, compute_cache_file_name('content.', 'file.cmd'))
+        self.assertNotEqual(cache_file_name, compute_cache_file_name('content', 'other.cmd'))
+
     def test_extract_cmd_name(self):
         self.assertEqual(extract_cmd_name('file.cmd'), 'file')
         self.assertEqual(extract_cmd_name('file.'), 'file')
@@ -29,6 +51,32 @@ class TestCli(unittest.TestCase):
             self.assertEqual(extract_cmd_name(r'.\file.'), 'file')
             self.assertEqual(extract_cmd_name(r'.\file'), 'file')
 
+    def test_generate_html_file_cache(self):
+        with tempfile.TemporaryDirectory() as directory_name:
+            self.addCleanup(os.chdir, os.getcwd())
+            os.chdir(directory_name)
+            with open('file.cmd', 'w', encoding='utf-8') as cmd_file:
+                cmd_file.write('Cached content.')
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                with mock.patch('conwaymd.cli.cmd_to_html', wraps=cmd_to_html) as cmd_to_html_mock:
+                    generate_html_file('file', False, uses_command_line_argument=True, cache_enabled=True)
+                self.assertEqual(cmd_to_html_mock.call_count, 1)  # miss
+
+                cache_file_name = compute_cache_file_name('Cached content.', 'file.cmd')
+                with open('file.html', 'r', encoding='utf-8') as html_file:
+                    html = html_file.read()
+                with open(cache_file_name, 'r', encoding='utf-8') as cache_file:
+                    self.assertEqual(cache_file.read(), html)
+                self.assertEqual(os.listdir(CACHE_DIRECTORY_NAME), [os.path.basename(cache_file_name)])
+
+                os.remove('file.html')
+                with mock.patch('conwaymd.cli.cmd_to_html') as cmd_to_html_mock:
+                    generate_html_file('file', False, uses_command_line_argument=True, cache_enabled=True)
+                self.assertEqual(cmd_to_html_mock.call_count, 0)  # hit
+                with open('file.html', 'r', encoding='utf-8') as html_file:
+                    self.assertEqual(html_file.read(), html)
+
     def test_is_cmd_file(self):
         self.assertTrue(is_cmd_file('file.cmd'))
         self.assertTrue(is_cmd_file('.cmd'))
@@ -36,6 +84,58 @@ class TestCli(unittest.TestCase):
         self.assertFalse(is_cmd_file('file.'))
         self.assertFalse(is_cmd_file('file'))
 
+    def test_iterate_cmd_file_names(self):
+        with tempfile.TemporaryDirectory() as directory_name:
+            for file_name in ['a.cmd', 'b.html', os.path.join('sub', 'c.cmd'), os.path.join('sub', 'd.cmd.bak')]:
+                file_path = os.path.join(directory_name, file_name)
+                os.makedirs(os.path.dirname(file_path), exist_ok=True)
+                open(file_path, 'w').close()
+
+            self.assertEqual(
+                sorted(iterate_cmd_file_names(directory_name)),
+                [os.path.join(directory_name, 'a.cmd'), os.path.join(directory_name, 'sub', 'c.cmd')],
+            )
+
+            os.symlink(os.path.join(directory_name, 'nonexistent'), os.path.join(directory_name, 'broken'))
+            os.symlink(os.path.join(directory_name, 'sub'), os.path.join(directory_name, 'linked'))
+            self.assertEqual(
+                sorted(iterate_cmd_file_names(directory_name)),
+                [os.path.join(directory_name, 'a.cmd'), os.path.join(directory_name, 'sub', 'c.cmd')],
+            )
+
+            unexaminable_entry = mock.Mock()
+            unexaminable_entry.is_dir.side_effect = PermissionError
+            with mock.patch('os.scandir', return_value=[unexaminable_entry]):
+                self.assertEqual(list(iterate_cmd_file_names(directory_name)), [])
+
+    def test_main_all_mode_parallel(self):
+        with tempfile.TemporaryDirectory() as directory_name:
+            self.addCleanup(os.chdir, os.getcwd())
+            os.chdir(directory_name)
+            for cmd_name in ['a', 'b', 'c']:
+                with open(f'{cmd_name}.cmd', 'w', encoding='utf-8') as cmd_file:
+                    cmd_file.write(f'Content `{cmd_name}`.')
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                with mock.patch('sys.argv', ['cmd', '-a', '-j', '2']):
+                    main()
+            for cmd_name in ['a', 'b', 'c']:
+                with open(f'{cmd_name}.html', 'r', encoding='utf-8') as html_file:
+                    self.assertIn(f'<code>{cmd_name}</code>', html_file.read())
+
+            with contextlib.redirect_stderr(io.StringIO()):
+                with mock.patch('sys.argv', ['cmd', '-j', '2', 'a.cmd']):
+                    with self.assertRaises(SystemExit) as context:
+                        main()
+            self.assertEqual(context.exception.code, COMMAND_LINE_ERROR_EXIT_CODE)
+
+            with open('b.cmd', 'w', encoding='utf-8') as cmd_file:
+                cmd_file.write('NonexistentReplacement: #x\n%%%\n')
+            with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+                with mock.patch('sys.argv', ['cmd', '-a', '-j', '2']):
+                    with self.assertRaises(SystemExit):
+                        main()
+
 
 if __name__ == '__main__':
     unittest.main()
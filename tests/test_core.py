@@ -6,11 +6,14 @@ Licensed under "MIT No Attribution" (MIT-0), see LICENSE.
 Perform unit testing for `core.py`.
 """
 
+import re
 import unittest
 
 from conwaymd._version import __version__
 from conwaymd.core import extract_rules_and_content, extract_separator_normalised_cmd_name
 from conwaymd.core import cmd_to_html
+from conwaymd.exceptions import RulesFileException
+from conwaymd.placeholders import PlaceholderMaster
 
 
 class TestCore(unittest.TestCase):
@@ -1008,6 +1011,43 @@ Everything is everything, and everything is dumb.
             '',
         )
 
+    def test_cmd_to_html_discarding_replacement(self):
+        self.assertEqual(
+            cmd_to_html(
+                cmd=r'''
+RegexDictionaryReplacement: #.wipe
+- queue_position: AFTER #placeholder-unprotect
+* [\s\S]* -->
+* \A --> [x][lab]
+
+ReferencedLinkReplacement: #.nested-links
+
+ReplacementSequence: #.late-sequence
+- queue_position: AFTER #.wipe
+- replacements:
+    #.nested-links
+
+%%%
+
+[lab]: https://example.com
+''',
+                cmd_file_name='test_core.py',
+            ),
+            '<a' + PlaceholderMaster.protect(' href="https://example.com"') + '>x</a>',
+        )
+
+    def test_cmd_to_html_rules_file_exception(self):
+        with self.assertRaises(RulesFileException) as context:
+            cmd_to_html(cmd='NonexistentReplacement: #x\n%%%\n', cmd_file_name='test_core.py')
+        self.assertEqual(
+            str(context.exception),
+            '`test_core.py`, line 1: unrecognised replacement class `NonexistentReplacement`',
+        )
+
+        with self.assertRaises(RulesFileException) as context:
+            cmd_to_html(cmd='RegexDictionaryReplacement: #x\n* ( --> y\n\n%%%\n', cmd_file_name='test_core.py')
+        self.assertIsInstance(context.exception.__cause__, re.error)
+
 
 if __name__ == '__main__':
     unittest.main()
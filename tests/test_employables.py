@@ -17,6 +17,7 @@ from conwaymd.employables import (
     PartitioningReplacement,
     ReferenceDefinitionReplacement,
     ReferencedImageReplacement,
+    RegexDictionaryReplacement,
     SpecifiedImageReplacement,
 )
 
@@ -40,7 +41,7 @@ class TestEmployables(unittest.TestCase):
             ),
             r'(?P<flags> [ui]* )'
             r'\{'
-            r'(?P<extensible_delimiter> \+{2,} )'
+            r'(?P<extensible_delimiter>\+{2,})'
             r'(?P<content> [\s\S]*? )'
             r'(?P=extensible_delimiter)'
             r'\}',
@@ -58,7 +59,7 @@ class TestEmployables(unittest.TestCase):
                 epilogue_delimiter='',
             ),
             r'^ [^\S\n]*'
-            r'(?P<extensible_delimiter> \${4,} )'
+            r'(?P<extensible_delimiter>\${4,})'
             r'(?: \{ (?P<attribute_specifications> [^}]*? ) \} )?'
             r'\n'
             r'(?P<content> [\s\S]*? )'
@@ -192,6 +193,25 @@ class TestEmployables(unittest.TestCase):
             ),
             r'a|b|c|\#\$\&\*\+\-\.\^\\\|\~',
         )
+        self.assertEqual(
+            OrdinaryDictionaryReplacement.build_simultaneous_regex_pattern(
+                substitute_from_pattern={
+                    f'{prefix}{suffix}': 'x'
+                    for prefix in ['ab', 'ac', 'b']
+                    for suffix in ['1', '2', '3', '4', '5', '6']
+                },
+            ),
+            r'(?:a(?:b(?:1|2|3|4|5|6)|c(?:1|2|3|4|5|6))|b(?:1|2|3|4|5|6))',
+        )
+        self.assertEqual(
+            OrdinaryDictionaryReplacement.build_simultaneous_regex_pattern(
+                substitute_from_pattern={
+                    f'a{suffix}': 'x'
+                    for suffix in ['', '1', '2', '3', '4', '5', '6', '7', '8', '9', '10', '11', '12', '13', '14', '15']
+                },
+            ),
+            'a|a1|a2|a3|a4|a5|a6|a7|a8|a9|a10|a11|a12|a13|a14|a15',
+        )
 
     def test_partitioning_replacement_build_regex_pattern(self):
         self.assertEqual(
@@ -285,6 +305,28 @@ class TestEmployables(unittest.TestCase):
             r'(?: \[ [\s]* (?P<label> [^\]]*? ) [\s]* \] )?',
         )
 
+    def test_regex_dictionary_replacement_discards_input(self):
+        replacement = RegexDictionaryReplacement('test', verbose_mode_enabled=False)
+        self.assertFalse(replacement.discards_input())
+
+        replacement.add_substitution(r'[\s\S]*', '')
+        replacement.add_substitution(r'\A', 'x')
+        self.assertTrue(replacement.discards_input())
+
+        replacement = RegexDictionaryReplacement('test', verbose_mode_enabled=False)
+        replacement.add_substitution(r'[\s\S]*', 'x')
+        self.assertFalse(replacement.discards_input())
+
+        replacement = RegexDictionaryReplacement('test', verbose_mode_enabled=False)
+        replacement.add_substitution(r'\A', 'x')
+        replacement.add_substitution(r'[\s\S]*', '')
+        self.assertFalse(replacement.discards_input())
+
+        replacement = RegexDictionaryReplacement('test', verbose_mode_enabled=False)
+        replacement.add_substitution(r'[\s\S]*', '')
+        replacement.concluding_replacements = [RegexDictionaryReplacement('concluding', verbose_mode_enabled=False)]
+        self.assertFalse(replacement.discards_input())
+
     def test_specified_image_replacement_build_regex_pattern(self):
         self.assertEqual(
             SpecifiedImageReplacement.build_regex_pattern(
@@ -16,6 +16,8 @@ class TestIdioms(unittest.TestCase):
         self.assertEqual(build_attributes_sequence(''), '')
         self.assertEqual(build_attributes_sequence('  '), '')
         self.assertEqual(build_attributes_sequence('\t'), '')
+        self.assertEqual(build_attributes_sequence(' \n', use_protection=True), '\uF8FF\uF8FF')
+        self.assertEqual(build_attributes_sequence('\u00A0'), ' \u00A0')
         self.assertEqual(build_attributes_sequence('   \n name=value\n    '), ' name="value"')
         self.assertEqual(build_attributes_sequence(' empty1="" empty2=  boolean'), ' empty1="" empty2="" boolean')
         self.assertEqual(
@@ -25,6 +27,9 @@ class TestIdioms(unittest.TestCase):
         self.assertEqual(build_attributes_sequence('-before before after -after'), ' before')
         self.assertEqual(build_attributes_sequence('-before before=no after=yes -after'), ' before="no"')
         self.assertEqual(build_attributes_sequence('.1 .2 .3 .4 #a #b #c -id -class'), '')
+        self.assertEqual(build_attributes_sequence('.a class'), ' class')
+        self.assertEqual(build_attributes_sequence('.a class .b'), ' class="b"')
+        self.assertEqual(build_attributes_sequence('class .a'), ' class="a"')
         self.assertEqual(
             build_attributes_sequence('#=top .=good    l=en    r=3    c=2'),
             ' id="top" class="good" lang="en" rowspan="3" colspan="2"',
@@ -39,7 +44,7 @@ class TestIdioms(unittest.TestCase):
         )
 
     def test_build_extensible_delimiter_opening_regex(self):
-        self.assertEqual(build_extensible_delimiter_opening_regex('$', 5), r'(?P<extensible_delimiter> \${5,} )')
+        self.assertEqual(build_extensible_delimiter_opening_regex('$', 5), r'(?P<extensible_delimiter>\${5,})')
 
     def test_build_flags_regex(self):
         self.assertEqual(build_flags_regex({}, False), '')
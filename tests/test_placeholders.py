@@ -32,6 +32,18 @@ class TestPlaceholders(unittest.TestCase):
         self.assertEqual(PlaceholderMaster.unprotect('\uF8FF\uE0F0\uE090\uE08D\uE088\uF8FF'), '𐍈')
         self.assertEqual(PlaceholderMaster.unprotect('\uF8FF\uE0E4\uE0B8\uE080\uE0E9\uE0BF\uE090\uF8FF'), '一鿐')
 
+    def test_placeholder_master_replace_marker_occurrences(self):
+        marker = PlaceholderMaster.MARKER
+        marker_placeholder = PlaceholderMaster.protect(marker)
+
+        self.assertEqual(PlaceholderMaster.replace_marker_occurrences(''), '')
+        self.assertEqual(PlaceholderMaster.replace_marker_occurrences(marker), marker_placeholder)
+        self.assertEqual(
+            PlaceholderMaster.replace_marker_occurrences(f'a{marker}b{marker}'),
+            f'a{marker_placeholder}b{marker_placeholder}',
+        )
+        self.assertEqual(PlaceholderMaster.unprotect(marker_placeholder), marker)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -12,7 +12,9 @@ from conwaymd.utilities import (
     compute_longest_common_prefix,
     de_indent,
     escape_attribute_value_html,
+    iterate_lines,
     none_to_empty_string,
+    truncate,
 )
 
 
@@ -78,11 +80,26 @@ Whitespace before closing delimiter:
         self.assertEqual(escape_attribute_value_html('&#XAbCdeF;'), '&#XAbCdeF;')
         self.assertEqual(escape_attribute_value_html('&#x1234567;'), '&amp;#x1234567;')
 
+    def test_iterate_lines(self):
+        self.assertEqual(list(iterate_lines('')), [])
+        self.assertEqual(list(iterate_lines('\n')), [''])
+        self.assertEqual(list(iterate_lines('a')), ['a'])
+        self.assertEqual(list(iterate_lines('a\nb\n')), ['a', 'b'])
+        self.assertEqual(list(iterate_lines('a\r\n\nb')), ['a', '', 'b'])
+        self.assertEqual(list(iterate_lines('a\rb\r\r\n')), ['a', 'b', ''])
+        self.assertEqual(list(iterate_lines('a\vb\fc\u2028d\x85')), ['a', 'b', 'c', 'd'])
+
     def test_none_to_empty_string(self):
         self.assertEqual(none_to_empty_string(''), '')
         self.assertEqual(none_to_empty_string(None), '')
         self.assertEqual(none_to_empty_string('xyz'), 'xyz')
 
+    def test_truncate(self):
+        self.assertEqual(truncate(''), '')
+        self.assertEqual(truncate('x' * 80), 'x' * 80)
+        self.assertEqual(truncate('x' * 81), 'x' * 77 + '...')
+        self.assertEqual(truncate('abcdef', max_length=5), 'ab...')
+
 
 if __name__ == '__main__':
     unittest.main()